@@ -3,6 +3,7 @@ Django settings for app_tracker project.
 """
 
 import os
+import sys
 from pathlib import Path
 from decouple import config
 
@@ -99,6 +100,37 @@ else:
         }
     }
 
+# Fast local test runs: use an in-memory SQLite database regardless of
+# DATABASE_URL. CI should leave this unset to test against the real engine.
+# Only test runs honour it, so a leaked TEST_FAST can't point migrate,
+# runserver or setup scripts at a throwaway database.
+RUNNING_TESTS = sys.argv[1:2] == ['test'] or os.path.basename(sys.argv[0]) == 'run_tests.py'
+if RUNNING_TESTS and config('TEST_FAST', default=False, cast=bool):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+            'TEST': {'NAME': ':memory:'},
+        }
+    }
+
+# Cache (Redis when REDIS_URL is set, per-process local memory otherwise)
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -144,6 +176,28 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20,
 }
 
+# Render API responses with orjson when it is installed
+try:
+    import orjson  # noqa: F401
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+        'apps.inventory.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ]
+except ImportError:
+    pass
+
+# N+1 query detection (optional dev dependency, only enabled in DEBUG)
+try:
+    import nplusone  # noqa: F401
+    NPLUSONE_ENABLED = DEBUG
+except ImportError:
+    NPLUSONE_ENABLED = False
+
+if NPLUSONE_ENABLED:
+    INSTALLED_APPS.append('nplusone.ext.django')
+    MIDDLEWARE.insert(0, 'nplusone.ext.django.NPlusOneMiddleware')
+    NPLUSONE_RAISE = config('NPLUSONE_RAISE', default=False, cast=bool)
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",  # SvelteKit dev server
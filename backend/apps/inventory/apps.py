@@ -7,8 +7,9 @@ class InventoryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     
     def ready(self):
-        """Import audit signals when the app is ready"""
+        """Import audit and cache invalidation signals when the app is ready"""
         try:
             from . import audit_signals
         except ImportError:
             pass
+        from . import caching
@@ -25,16 +25,20 @@ class AuditMixin(models.Model):
     
     def _store_original_values(self):
         """Store original field values for change detection"""
+        deferred = self.get_deferred_fields()
         for field in self._meta.fields:
-            if hasattr(self, field.name):
-                value = getattr(self, field.name)
-                # Convert to JSON-serializable format
-                if hasattr(value, 'pk'):  # Foreign key
-                    self._original_values[field.name] = value.pk if value else None
-                elif hasattr(value, 'isoformat'):  # DateTime
-                    self._original_values[field.name] = value.isoformat() if value else None
-                else:
-                    self._original_values[field.name] = value
+            if field.attname not in deferred:
+                self._original_values[field.name] = self._get_comparable_value(field)
+    
+    def _get_comparable_value(self, field):
+        """Get a field's current value in a JSON-serializable, comparable form"""
+        if field.is_relation:
+            # Foreign key: read the raw id so the related object is never loaded
+            return getattr(self, field.attname)
+        value = getattr(self, field.name)
+        if hasattr(value, 'isoformat'):  # DateTime
+            return value.isoformat() if value else None
+        return value
     
     def get_field_changes(self):
         """Get dictionary of changed fields with old and new values"""
@@ -44,28 +48,22 @@ class AuditMixin(models.Model):
         changes = {}
         for field in self._meta.fields:
             field_name = field.name
-            if hasattr(self, field_name):
-                current_value = getattr(self, field_name)
-                
-                # Convert current value to comparable format
-                if hasattr(current_value, 'pk'):  # Foreign key
-                    current_comparable = current_value.pk if current_value else None
-                elif hasattr(current_value, 'isoformat'):  # DateTime
-                    current_comparable = current_value.isoformat() if current_value else None
-                else:
-                    current_comparable = current_value
-                
-                original_value = self._original_values.get(field_name)
+            # Skip fields that were deferred when the original values were stored
+            if field_name not in self._original_values:
+                continue
+            
+            current_comparable = self._get_comparable_value(field)
+            original_value = self._original_values[field_name]
+            
+            if current_comparable != original_value:
+                # Format values for display
+                old_display = self._format_field_value(field, original_value)
+                new_display = self._format_field_value(field, current_comparable)
                 
-                if current_comparable != original_value:
-                    # Format values for display
-                    old_display = self._format_field_value(field, original_value)
-                    new_display = self._format_field_value(field, current_comparable)
-                    
-                    changes[field_name] = {
-                        'old': old_display,
-                        'new': new_display
-                    }
+                changes[field_name] = {
+                    'old': old_display,
+                    'new': new_display
+                }
         
         return changes
     
@@ -0,0 +1,87 @@
+"""
+Cache keys and signal-driven invalidation for cached API responses.
+"""
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import UserProfile, Application
+
+# Seconds a user's permission summary may be served from cache
+PERMISSIONS_SUMMARY_TTL = 30
+
+# Seconds a user list page is fresh, and how long an expired copy is kept
+# to serve if the database becomes unavailable
+USER_LIST_TTL = 30
+USER_LIST_STALE_TTL = 60 * 60
+USER_LIST_VERSION_KEY = 'userlist:version'
+
+# Seconds the application dashboard statistics may be served from cache
+DASHBOARD_STATS_TTL = 30
+DASHBOARD_STATS_VERSION_KEY = 'app_stats:version'
+
+
+def permissions_summary_key(user_id):
+    """Cache key for a user's permission summary"""
+    return f'user_perms:{user_id}'
+
+
+def user_list_key(role, full_path):
+    """Cache key for one page of the user list as seen by a role"""
+    return f'userlist:v1:{role}:{full_path}'
+
+
+def user_list_version():
+    """Current user list version; cached pages from older versions are stale"""
+    return _get_version(USER_LIST_VERSION_KEY)
+
+
+def invalidate_user_lists():
+    """Mark every cached user list page as stale"""
+    _bump_version(USER_LIST_VERSION_KEY)
+
+
+def dashboard_stats_key():
+    """Cache key for the current version of the application dashboard statistics"""
+    return f'app_stats:{_get_version(DASHBOARD_STATS_VERSION_KEY)}'
+
+
+def invalidate_dashboard_stats():
+    """Mark the cached application dashboard statistics as stale"""
+    _bump_version(DASHBOARD_STATS_VERSION_KEY)
+
+
+def _get_version(key):
+    """Read a cache version counter, starting it at 1"""
+    return cache.get_or_set(key, 1, None)
+
+
+def _bump_version(key):
+    """Increment a cache version counter"""
+    try:
+        cache.incr(key)
+    except ValueError:
+        # No version yet, so nothing has been cached
+        pass
+
+
+@receiver([post_save, post_delete], sender=UserProfile)
+def invalidate_profile_caches(sender, instance, **kwargs):
+    """Drop cached data derived from a user's profile"""
+    cache.delete(permissions_summary_key(instance.user_id))
+    invalidate_user_lists()
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_caches(sender, instance, **kwargs):
+    """Drop cached data derived from a user account"""
+    cache.delete(permissions_summary_key(instance.pk))
+    invalidate_user_lists()
+
+
+@receiver([post_save, post_delete], sender=Application)
+def invalidate_application_caches(sender, instance, **kwargs):
+    """Drop cached data derived from applications"""
+    invalidate_dashboard_stats()
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('inventory', '0003_userprofile_has_documentation_access'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recordpermission',
+            index=models.Index(fields=['user', 'granted_at'], name='inventory_r_user_id_354eef_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recordpermission',
+            index=models.Index(fields=['content_type', 'object_id'], name='inventory_r_content_76c934_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0004_recordpermission_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['name'], name='inventory_a_name_e440b9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['lifecycle_stage', 'name'], name='inventory_a_lifecyc_cc7530_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['criticality', 'name'], name='inventory_a_critica_34bf27_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['is_active', 'name'], name='inventory_a_is_acti_f74b2a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationlifecycleevent',
+            index=models.Index(fields=['application', '-event_date'], name='inventory_a_applica_328111_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationlifecycleevent',
+            index=models.Index(fields=['-event_date'], name='inventory_a_event_d_e60f16_idx'),
+        ),
+    ]
@@ -56,13 +56,35 @@ class UserProfile(AuditMixin, models.Model):
         # Other users need explicit permission
         return self.has_documentation_access
     
-    def save(self, *args, **kwargs):
+    def compute_permissions(self):
+        """Return all role-based permission flags as a single dict.
+        
+        Every flag derives from columns on this row, so serializing a list of
+        profiles never triggers per-row queries.
+        """
+        return {
+            'can_manage_users': self.can_manage_users(),
+            'can_view_system_notes': self.can_view_system_notes(),
+            'can_create_records': self.can_create_records(),
+            'can_delete_records': self.can_delete_records(),
+            'has_write_access': self.has_write_access(),
+            'can_access_documentation': self.can_access_documentation(),
+        }
+    
+    def apply_documentation_defaults(self):
+        """Grant the documentation access implied by the role.
+        
+        Called by save(); bulk inserts and updates must call it themselves.
+        """
         # Auto-grant documentation access for application admins (non-revokable)
         if self.role == 'application_admin':
             self.has_documentation_access = True
         # Auto-grant documentation access for systems managers (revokable)
         elif self.role == 'systems_manager' and not self.pk:  # Only on creation
             self.has_documentation_access = True
+    
+    def save(self, *args, **kwargs):
+        self.apply_documentation_defaults()
         super().save(*args, **kwargs)
 
 
@@ -86,6 +108,10 @@ class RecordPermission(AuditMixin, models.Model):
     class Meta:
         unique_together = ['user', 'content_type', 'object_id']
         ordering = ['-granted_at']
+        indexes = [
+            models.Index(fields=['user', 'granted_at']),
+            models.Index(fields=['content_type', 'object_id']),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.permission_type} access"
@@ -303,6 +329,13 @@ class Application(AuditMixin, models.Model):
 
     class Meta:
         ordering = ['name']
+        # Match the API's default name ordering, alone and under its common filters
+        indexes = [
+            models.Index(fields=['name']),
+            models.Index(fields=['lifecycle_stage', 'name']),
+            models.Index(fields=['criticality', 'name']),
+            models.Index(fields=['is_active', 'name']),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.lifecycle_stage})"
@@ -359,6 +392,10 @@ class ApplicationLifecycleEvent(models.Model):
 
     class Meta:
         ordering = ['application', '-event_date']
+        indexes = [
+            models.Index(fields=['application', '-event_date']),
+            models.Index(fields=['-event_date']),
+        ]
 
     def __str__(self):
         return f"{self.application.name}: {self.from_stage} -> {self.to_stage}"
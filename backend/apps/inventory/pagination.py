@@ -0,0 +1,11 @@
+"""
+Pagination classes for the inventory API.
+"""
+
+from rest_framework.pagination import CursorPagination
+
+
+class LifecycleEventCursorPagination(CursorPagination):
+    """Keyset pagination for the append-only lifecycle event log"""
+    # Pages seek on the event_date index instead of counting and skipping rows
+    ordering = '-event_date'
@@ -0,0 +1,32 @@
+"""
+Response renderers for the inventory API.
+"""
+
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(BaseRenderer):
+    """Render JSON responses with orjson instead of the stdlib json module"""
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+    
+    # DRF's encoder handles the few types orjson can't (Decimal, lazy strings, querysets)
+    _default = staticmethod(JSONEncoder().default)
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        
+        # Match DRF's "Z" suffix for UTC datetimes returned by .values() rows
+        option = orjson.OPT_UTC_Z
+        # List serializer errors are keyed by item index
+        option |= orjson.OPT_NON_STR_KEYS
+        renderer_context = renderer_context or {}
+        if renderer_context.get('indent'):
+            # The browsable API asks for indented output
+            option |= orjson.OPT_INDENT_2
+        
+        return orjson.dumps(data, default=self._default, option=option)
@@ -1,3 +1,5 @@
+import copy
+
 from rest_framework import serializers
 from .models import (
     CloudPlatform, ServerEnvironment, Language, DataStore,
@@ -7,7 +9,21 @@ from .models import (
 )
 
 
-class CloudPlatformSerializer(serializers.ModelSerializer):
+class CachedFieldsMixin:
+    """Build a serializer's fields once per class and hand out fresh copies.
+    
+    ModelSerializer otherwise re-inspects the model on every instantiation,
+    which adds up when many=True serializers are built on each request.
+    """
+    
+    def get_fields(self):
+        cls = type(self)
+        if '_field_layout' not in cls.__dict__:
+            cls._field_layout = super().get_fields()
+        return copy.deepcopy(cls._field_layout)
+
+
+class CloudPlatformSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     server_count = serializers.SerializerMethodField()
     
     class Meta:
@@ -16,10 +32,10 @@ class CloudPlatformSerializer(serializers.ModelSerializer):
         read_only_fields = ('created_at', 'updated_at')
     
     def get_server_count(self, obj):
-        return obj.servers.count()
+        return obj.serverenvironment_set.count()
 
 
-class ServerEnvironmentSerializer(serializers.ModelSerializer):
+class ServerEnvironmentSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     cloud_platform_name = serializers.CharField(source='cloud_platform.name', read_only=True)
     application_count = serializers.SerializerMethodField()
     
@@ -29,10 +45,10 @@ class ServerEnvironmentSerializer(serializers.ModelSerializer):
         read_only_fields = ('created_at', 'updated_at')
     
     def get_application_count(self, obj):
-        return obj.primary_applications.count() + obj.additional_applications.count()
+        return obj.primary_applications.count() + obj.secondary_applications.count()
 
 
-class LanguageSerializer(serializers.ModelSerializer):
+class LanguageSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     installation_count = serializers.SerializerMethodField()
     
     class Meta:
@@ -41,10 +57,10 @@ class LanguageSerializer(serializers.ModelSerializer):
         read_only_fields = ('created_at', 'updated_at')
     
     def get_installation_count(self, obj):
-        return obj.installations.count()
+        return obj.languageinstallation_set.count()
 
 
-class DataStoreSerializer(serializers.ModelSerializer):
+class DataStoreSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     instance_count = serializers.SerializerMethodField()
     
     class Meta:
@@ -56,7 +72,7 @@ class DataStoreSerializer(serializers.ModelSerializer):
         return obj.datastoreinstance_set.count()
 
 
-class LanguageInstallationSerializer(serializers.ModelSerializer):
+class LanguageInstallationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     language_name = serializers.CharField(source='language.name', read_only=True)
     server_hostname = serializers.CharField(source='server.hostname', read_only=True)
     
@@ -66,7 +82,7 @@ class LanguageInstallationSerializer(serializers.ModelSerializer):
         read_only_fields = ('created_at', 'updated_at')
 
 
-class DataStoreInstanceSerializer(serializers.ModelSerializer):
+class DataStoreInstanceSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     datastore_name = serializers.CharField(source='datastore.name', read_only=True)
     datastore_type = serializers.CharField(source='datastore.datastore_type', read_only=True)
     server_hostname = serializers.CharField(source='server.hostname', read_only=True)
@@ -77,7 +93,7 @@ class DataStoreInstanceSerializer(serializers.ModelSerializer):
         read_only_fields = ('created_at', 'updated_at')
 
 
-class ApplicationLanguageDependencySerializer(serializers.ModelSerializer):
+class ApplicationLanguageDependencySerializer(CachedFieldsMixin, serializers.ModelSerializer):
     language_name = serializers.CharField(source='language_installation.language.name', read_only=True)
     language_version = serializers.CharField(source='language_installation.version', read_only=True)
     server_hostname = serializers.CharField(source='language_installation.server.hostname', read_only=True)
@@ -88,7 +104,7 @@ class ApplicationLanguageDependencySerializer(serializers.ModelSerializer):
         read_only_fields = ('created_at', 'updated_at')
 
 
-class ApplicationDataStoreDependencySerializer(serializers.ModelSerializer):
+class ApplicationDataStoreDependencySerializer(CachedFieldsMixin, serializers.ModelSerializer):
     datastore_name = serializers.CharField(source='datastore_instance.datastore.name', read_only=True)
     datastore_type = serializers.CharField(source='datastore_instance.datastore.datastore_type', read_only=True)
     server_hostname = serializers.CharField(source='datastore_instance.server.hostname', read_only=True)
@@ -99,7 +115,7 @@ class ApplicationDataStoreDependencySerializer(serializers.ModelSerializer):
         read_only_fields = ('created_at', 'updated_at')
 
 
-class ApplicationLifecycleEventSerializer(serializers.ModelSerializer):
+class ApplicationLifecycleEventSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     performed_by_username = serializers.CharField(source='performed_by.username', read_only=True)
     
     class Meta:
@@ -108,7 +124,7 @@ class ApplicationLifecycleEventSerializer(serializers.ModelSerializer):
         read_only_fields = ('event_date',)
 
 
-class ApplicationSerializer(serializers.ModelSerializer):
+class ApplicationSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     primary_server_hostname = serializers.CharField(source='primary_server.hostname', read_only=True)
     additional_servers_hostnames = serializers.SerializerMethodField()
     language_dependencies = ApplicationLanguageDependencySerializer(many=True, read_only=True)
@@ -126,7 +142,42 @@ class ApplicationSerializer(serializers.ModelSerializer):
         return [server.hostname for server in obj.additional_servers.all()]
 
 
-class CloudPluginSerializer(serializers.ModelSerializer):
+class ApplicationListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    """Summary serializer for application list pages, without nested relations"""
+    primary_server_hostname = serializers.CharField(source='primary_server.hostname', read_only=True)
+    
+    class Meta:
+        model = Application
+        fields = [
+            'id', 'name', 'description', 'lifecycle_stage', 'criticality', 'is_active',
+            'business_owner', 'technical_owner', 'primary_server', 'primary_server_hostname',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+    
+    def to_representation(self, instance):
+        """Build the output dict directly rather than field by field.
+        
+        The declared fields are only used to format the timestamps.
+        """
+        fields = self.fields
+        return {
+            'id': str(instance.id),
+            'name': instance.name,
+            'description': instance.description,
+            'lifecycle_stage': instance.lifecycle_stage,
+            'criticality': instance.criticality,
+            'is_active': instance.is_active,
+            'business_owner': instance.business_owner,
+            'technical_owner': instance.technical_owner,
+            'primary_server': instance.primary_server_id,
+            'primary_server_hostname': instance.primary_server.hostname,
+            'created_at': fields['created_at'].to_representation(instance.created_at),
+            'updated_at': fields['updated_at'].to_representation(instance.updated_at),
+        }
+
+
+class CloudPluginSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     cloud_platform_name = serializers.CharField(source='cloud_platform.name', read_only=True)
     
     class Meta:
@@ -148,7 +199,7 @@ class ApplicationDetailSerializer(ApplicationSerializer):
 class ServerEnvironmentDetailSerializer(ServerEnvironmentSerializer):
     """Extended serializer with applications and installations"""
     primary_applications = ApplicationSerializer(many=True, read_only=True)
-    additional_applications = ApplicationSerializer(many=True, read_only=True)
+    additional_applications = ApplicationSerializer(source='secondary_applications', many=True, read_only=True)
     language_installations = LanguageInstallationSerializer(many=True, read_only=True)
     datastore_instances = DataStoreInstanceSerializer(many=True, read_only=True)
     cloud_platform = CloudPlatformSerializer(read_only=True)
@@ -2,16 +2,30 @@
 Test suite for inventory API endpoints
 """
 
-from django.test import TestCase
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db import DatabaseError
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import ModelSerializer
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 import json
 
 from .models import (
-    UserProfile, CloudPlatform, ServerEnvironment,
-    Language, DataStore, Application
+    UserProfile, RecordPermission, CloudPlatform, ServerEnvironment,
+    Language, DataStore, LanguageInstallation, Application, ApplicationLanguageDependency,
+    ApplicationLifecycleEvent
 )
+from .caching import invalidate_user_lists
+from .renderers import ORJSONRenderer
+from .serializers import ApplicationListSerializer, ApplicationSerializer
+from .user_serializers import UserProfileSerializer
 
 
 class APIAuthenticationTest(APITestCase):
@@ -203,6 +217,78 @@ class ServerEnvironmentAPITest(APITestCase):
             # Test DELETE
             response = self.client.delete(f'/api/servers/{server_id}/')
             self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+    
+    def test_server_related_actions(self):
+        """Test the servers, resources and applications actions return related rows"""
+        server = ServerEnvironment.objects.create(
+            name='Action Server', hostname='action-server', ip_address='10.0.1.210',
+            operating_system='Ubuntu 22.04', os_version='22.04.3',
+            environment_type='virtual', cloud_platform=self.cloud_platform
+        )
+        language = Language.objects.create(name='Python')
+        LanguageInstallation.objects.create(server=server, language=language, version='3.11')
+        Application.objects.create(
+            name='Action App', description='Action test', business_purpose='Testing',
+            business_owner='Owner', technical_owner='Tech Team', primary_server=server,
+            created_by=self.admin_user, updated_by=self.admin_user
+        )
+        
+        response = self.client.get(f'/api/cloud-platforms/{self.cloud_platform.id}/servers/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['hostname'], 'action-server')
+        self.assertEqual(response.data[0]['cloud_platform_name'], 'Test Cloud')
+        self.assertEqual(response.data[0]['application_count'], 1)
+        
+        response = self.client.get(f'/api/servers/{server.id}/resources/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['language_installations'][0]['language_name'], 'Python')
+        self.assertEqual(response.data['datastore_instances'], [])
+        
+        other_server = ServerEnvironment.objects.create(
+            name='Other Server', hostname='other-server', ip_address='10.0.1.211',
+            operating_system='Ubuntu 22.04', os_version='22.04.3', environment_type='virtual'
+        )
+        shared_app = Application.objects.create(
+            name='Shared App', description='Action test', business_purpose='Testing',
+            business_owner='Owner', technical_owner='Tech Team', primary_server=other_server,
+            created_by=self.admin_user, updated_by=self.admin_user
+        )
+        shared_app.additional_servers.add(server, other_server)
+        
+        # The server row, one query for both application roles, then one per nested relation
+        with self.assertNumQueries(6):
+            response = self.client.get(f'/api/servers/{server.id}/applications/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_count'], 2)
+        self.assertEqual(response.data['primary_applications'][0]['primary_server_hostname'], 'action-server')
+        self.assertEqual(
+            [app['name'] for app in response.data['additional_applications']], ['Shared App']
+        )
+        self.assertEqual(
+            response.data['additional_applications'][0]['additional_servers_hostnames'],
+            ['action-server', 'other-server']
+        )
+        self.assertEqual(
+            response.data['additional_applications'][0].keys(),
+            ApplicationSerializer(shared_app).data.keys()
+        )
+    
+    def test_language_serializes_installation_count(self):
+        """Test languages report how many servers they are installed on"""
+        server = ServerEnvironment.objects.create(
+            name='Language Server', hostname='language-server', ip_address='10.0.1.212',
+            operating_system='Ubuntu 22.04', os_version='22.04.3', environment_type='virtual'
+        )
+        language = Language.objects.create(name='Go')
+        LanguageInstallation.objects.create(server=server, language=language, version='1.22')
+        
+        response = self.client.get(f'/api/languages/{language.id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['installation_count'], 1)
+        
+        response = self.client.get(f'/api/languages/{language.id}/installations/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['server_hostname'], 'language-server')
 
 
 class ApplicationAPITest(APITestCase):
@@ -279,6 +365,122 @@ class ApplicationAPITest(APITestCase):
             response = self.client.delete(f'/api/applications/{app_id}/')
             self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
     
+    def test_dashboard_stats(self):
+        """Test dashboard statistics are computed in a fixed number of queries"""
+        for name, is_active in (('Active App', True), ('Retired App', False)):
+            Application.objects.create(
+                name=name, description='Dashboard test', business_purpose='Testing',
+                business_owner='Owner', technical_owner='Tech Team',
+                primary_server=self.server, is_active=is_active,
+                created_by=self.admin_user, updated_by=self.admin_user
+            )
+        
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/applications/dashboard_stats/')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_applications'], 2)
+        self.assertEqual(response.data['active_applications'], 1)
+        self.assertEqual(response.data['inactive_applications'], 1)
+        self.assertEqual(
+            response.data['by_lifecycle_stage'],
+            [{'lifecycle_stage': 'development', 'count': 2}]
+        )
+    
+    def test_dashboard_stats_cached_until_applications_change(self):
+        """Test dashboard statistics support 304s and refresh after a change"""
+        response = self.client.get('/api/applications/dashboard_stats/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/applications/dashboard_stats/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        Application.objects.create(
+            name='New App', description='Dashboard test', business_purpose='Testing',
+            business_owner='Owner', technical_owner='Tech Team', primary_server=self.server,
+            created_by=self.admin_user, updated_by=self.admin_user
+        )
+        response = self.client.get('/api/applications/dashboard_stats/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_applications'], 1)
+    
+    def test_update_records_lifecycle_event_only_on_stage_change(self):
+        """Test PATCH logs the previous stage and skips unchanged stages"""
+        application = Application.objects.create(
+            name='Patched App', description='Update test', business_purpose='Testing',
+            business_owner='Owner', technical_owner='Tech Team', primary_server=self.server,
+            created_by=self.admin_user, updated_by=self.admin_user
+        )
+        url = f'/api/applications/{application.id}/'
+        
+        response = self.client.patch(url, {'lifecycle_stage': 'testing'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.patch(url, {'lifecycle_stage': 'testing', 'version': '1.1'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        events = ApplicationLifecycleEvent.objects.filter(application=application)
+        self.assertEqual(
+            list(events.values_list('from_stage', 'to_stage', 'performed_by')),
+            [('development', 'testing', self.admin_user.id)]
+        )
+    
+    def test_change_lifecycle_stage_action(self):
+        """Test the lifecycle action saves the stage and records the event"""
+        application = Application.objects.create(
+            name='Staged App', description='Action test', business_purpose='Testing',
+            business_owner='Owner', technical_owner='Tech Team', primary_server=self.server,
+            created_by=self.admin_user, updated_by=self.admin_user
+        )
+        url = f'/api/applications/{application.id}/change_lifecycle_stage/'
+        
+        response = self.client.post(url, {'lifecycle_stage': 'bogus'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        response = self.client.post(url, {'lifecycle_stage': 'production'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['application']['lifecycle_stage'], 'production')
+        
+        application.refresh_from_db()
+        self.assertEqual(application.lifecycle_stage, 'production')
+        self.assertEqual(application.description, 'Action test')
+        self.assertTrue(
+            ApplicationLifecycleEvent.objects.filter(
+                application=application, from_stage='development', to_stage='production'
+            ).exists()
+        )
+    
+    def test_lifecycle_events_use_cursor_pagination(self):
+        """Test lifecycle events page by cursor, newest first"""
+        application = Application.objects.create(
+            name='Paged App', description='Paging test', business_purpose='Testing',
+            business_owner='Owner', technical_owner='Tech Team', primary_server=self.server,
+            created_by=self.admin_user, updated_by=self.admin_user
+        )
+        ApplicationLifecycleEvent.objects.bulk_create([
+            ApplicationLifecycleEvent(
+                application=application, to_stage='testing', performed_by=self.admin_user
+            )
+            for _ in range(25)
+        ])
+        
+        response = self.client.get('/api/application-lifecycle-events/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        first_page = response.data['results']
+        self.assertEqual(len(first_page), 20)
+        dates = [event['event_date'] for event in first_page]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+        
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertIsNone(response.data['next'])
+        self.assertFalse(
+            {event['id'] for event in first_page} & {event['id'] for event in response.data['results']}
+        )
+    
     def test_application_lifecycle_workflow(self):
         """Test application lifecycle progression"""
         app_data = {
@@ -367,6 +569,194 @@ class UserManagementAPITest(APITestCase):
         response = self.client.patch(f'/api/user-profiles/{self.user_profile.id}/', update_data)
         if response.status_code != status.HTTP_404_NOT_FOUND:
             self.assertIn(response.status_code, [status.HTTP_200_OK, status.HTTP_403_FORBIDDEN])
+    
+    def test_user_profile_partial_update_saves_sent_fields(self):
+        """Test partial updates write user and profile fields that were sent"""
+        self.client.force_authenticate(user=self.admin_user)
+        
+        response = self.client.patch(f'/api/user-profiles/{self.user_profile.id}/', {
+            'first_name': 'Renamed',
+            'department': 'Operations'
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        self.user_profile.refresh_from_db()
+        self.regular_user.refresh_from_db()
+        self.assertEqual(self.user_profile.department, 'Operations')
+        self.assertEqual(self.regular_user.first_name, 'Renamed')
+        self.assertEqual(response.data['first_name'], 'Renamed')
+    
+    def test_current_user_profile_created_once(self):
+        """Test the current profile endpoint creates a missing profile only once"""
+        new_user = User.objects.create_user(username='noprofile', email='noprofile@test.com')
+        self.client.force_authenticate(user=new_user)
+        
+        for _ in range(2):
+            response = self.client.get('/api/auth/profile/')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['role'], 'business_user')
+        
+        self.assertEqual(UserProfile.objects.filter(user=new_user).count(), 1)
+    
+    def test_user_list_cache_invalidated_on_user_change(self):
+        """Test cached user list pages are refreshed after a user is added"""
+        self.client.force_authenticate(user=self.admin_user)
+        
+        response = self.client.get('/api/users/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        count = response.data['count']
+        
+        new_user = User.objects.create_user(username='listeduser', email='listed@test.com')
+        UserProfile.objects.create(user=new_user, role='technician')
+        
+        response = self.client.get('/api/users/')
+        self.assertEqual(response.data['count'], count + 1)
+    
+    def test_user_list_omits_notes(self):
+        """Test the user list leaves out notes while the detail view keeps them"""
+        self.client.force_authenticate(user=self.admin_user)
+        
+        response = self.client.get('/api/users/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('notes', response.data['results'][0])
+        
+        response = self.client.get(f'/api/users/{self.user_profile.id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('notes', response.data)
+    
+    def test_user_list_served_stale_when_database_unavailable(self):
+        """Test the last cached user list is returned if the query fails"""
+        self.client.force_authenticate(user=self.admin_user)
+        
+        response = self.client.get('/api/users/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        invalidate_user_lists()
+        
+        with mock.patch(
+            'rest_framework.generics.ListCreateAPIView.list',
+            side_effect=DatabaseError('database unavailable')
+        ):
+            stale_response = self.client.get('/api/users/')
+        
+        self.assertEqual(stale_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(stale_response.data, response.data)
+    
+    def test_create_user_rejects_weak_passwords(self):
+        """Test user creation runs the configured password validators"""
+        self.client.force_authenticate(user=self.admin_user)
+        payload = {
+            'username': 'weakpass', 'first_name': 'Weak', 'last_name': 'Pass',
+            'email': 'weak@test.com', 'role': 'business_user'
+        }
+        
+        for password in ('short', 'password123'):
+            response = self.client.post('/api/users/', {
+                **payload, 'password': password, 'password_confirm': password
+            })
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('password', response.data)
+        
+        self.assertFalse(User.objects.filter(username='weakpass').exists())
+    
+    def test_user_stats(self):
+        """Test user statistics are aggregated in a fixed number of queries"""
+        self.client.force_authenticate(user=self.admin_user)
+        
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/users/stats/')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_users'], 2)
+        self.assertEqual(response.data['active_users'], 2)
+        self.assertEqual(response.data['users_by_role']['application_admin'], 1)
+        self.assertEqual(response.data['users_by_role']['business_user'], 1)
+        self.assertEqual(response.data['users_by_role']['technician'], 0)
+        self.assertEqual(response.data['pending_permissions'], 0)
+    
+    def test_current_user_profile_not_modified(self):
+        """Test the current profile endpoint answers 304 for a matching ETag"""
+        self.client.force_authenticate(user=self.regular_user)
+        
+        response = self.client.get('/api/auth/profile/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        
+        response = self.client.get('/api/auth/profile/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        self.regular_user.first_name = 'Changed'
+        self.regular_user.save()
+        response = self.client.get('/api/auth/profile/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['first_name'], 'Changed')
+    
+    def test_permissions_summary_refreshes_after_role_change(self):
+        """Test cached permission summaries are invalidated on profile save"""
+        self.client.force_authenticate(user=self.regular_user)
+        
+        response = self.client.get('/api/auth/permissions/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['permissions']['has_write_access'])
+        
+        self.user_profile.role = 'technician'
+        self.user_profile.save()
+        
+        response = self.client.get('/api/auth/permissions/')
+        self.assertEqual(response.data['role'], 'technician')
+        self.assertTrue(response.data['permissions']['has_write_access'])
+    
+    def test_assign_record_permissions_in_bulk(self):
+        """Test assigning several record permissions in one request"""
+        self.client.force_authenticate(user=self.admin_user)
+        content_type = ContentType.objects.get_for_model(CloudPlatform)
+        
+        payload = [
+            {'user': self.regular_user.id, 'content_type': content_type.id,
+             'object_id': object_id, 'permission_type': 'read'}
+            for object_id in (1, 2)
+        ]
+        response = self.client.post('/api/auth/assign-permission/', payload, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 2)
+        self.assertTrue(all(item['id'] for item in response.data))
+        self.assertEqual(
+            RecordPermission.objects.filter(
+                user=self.regular_user, granted_by=self.admin_user
+            ).count(),
+            2
+        )
+    
+    def test_assign_record_permission_rejects_unknown_content_type(self):
+        """Test content types are validated when resolved from the cache"""
+        self.client.force_authenticate(user=self.admin_user)
+        
+        for content_type in (999999, 'not-an-id'):
+            response = self.client.post('/api/auth/assign-permission/', {
+                'user': self.regular_user.id, 'content_type': content_type,
+                'object_id': 1, 'permission_type': 'read'
+            }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('content_type', response.data)
+    
+    def test_revoke_record_permission(self):
+        """Test revoking a record permission, then revoking it again"""
+        self.client.force_authenticate(user=self.admin_user)
+        permission = RecordPermission.objects.create(
+            user=self.regular_user,
+            content_type=ContentType.objects.get_for_model(CloudPlatform),
+            object_id=1,
+            permission_type='read',
+            granted_by=self.admin_user
+        )
+        url = f'/api/auth/revoke-permission/{permission.id}/'
+        
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(RecordPermission.objects.filter(id=permission.id).exists())
+        
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
 
 class RoleBasedAccessTest(APITestCase):
@@ -577,3 +967,172 @@ class IntegrationWorkflowTest(APITestCase):
                 self.skipTest("Could not create server for workflow test")
         else:
             self.skipTest("Could not create cloud platform for workflow test")
+
+
+class ListQueryCountTest(APITestCase):
+    """Test list endpoints issue a fixed number of queries however many rows exist"""
+    
+    def setUp(self):
+        """Set up test data"""
+        self.admin_user = User.objects.create_user(
+            username='querycountadmin',
+            email='querycount@test.com'
+        )
+        UserProfile.objects.create(user=self.admin_user, role='application_admin')
+        self.content_type = ContentType.objects.get_for_model(CloudPlatform)
+        
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin_user)
+    
+    def _add_users(self, count):
+        """Add users with profiles and a record permission each"""
+        start = User.objects.count()
+        usernames = [f'listed{i}' for i in range(start, start + count)]
+        User.objects.bulk_create([
+            User(username=username, email=f'{username}@test.com') for username in usernames
+        ])
+        # Reload for the ids, which MySQL bulk inserts don't set
+        users = list(User.objects.filter(username__in=usernames))
+        UserProfile.objects.bulk_create([
+            UserProfile(user=user, role='technician') for user in users
+        ])
+        RecordPermission.objects.bulk_create([
+            RecordPermission(
+                user=user, content_type=self.content_type, object_id=user.id,
+                granted_by=self.admin_user
+            )
+            for user in users
+        ])
+        # bulk_create skips the signals that invalidate cached user lists
+        invalidate_user_lists()
+    
+    def test_list_query_counts_are_constant(self):
+        """Test user and record permission lists don't grow queries per row"""
+        added = 0
+        for total in (1, 10, 100):
+            self._add_users(total - added)
+            added = total
+            
+            with self.subTest(rows=total):
+                # COUNT for pagination plus one joined SELECT
+                with self.assertNumQueries(2):
+                    response = self.client.get('/api/users/')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                
+                with self.assertNumQueries(2):
+                    response = self.client.get('/api/record-permissions/')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_lifecycle_event_list_query_count_is_constant(self):
+        """Test lifecycle event rows don't load related objects one by one"""
+        server = ServerEnvironment.objects.create(
+            name='Event Server', hostname='event-server', ip_address='10.0.1.220',
+            operating_system='Ubuntu 22.04', os_version='22.04.3', environment_type='virtual'
+        )
+        added = 0
+        for total in (1, 10):
+            for i in range(added, total):
+                performer = User.objects.create_user(username=f'performer{i}')
+                application = Application.objects.create(
+                    name=f'Event App {i}', description='Event test',
+                    business_purpose='Testing', business_owner='Owner', technical_owner='Tech Team',
+                    primary_server=server, created_by=performer, updated_by=performer
+                )
+                ApplicationLifecycleEvent.objects.create(
+                    application=application, from_stage='development', to_stage='testing',
+                    performed_by=performer
+                )
+            added = total
+            
+            with self.subTest(rows=total):
+                # Cursor pages skip the COUNT, leaving one joined SELECT
+                with self.assertNumQueries(1):
+                    response = self.client.get('/api/application-lifecycle-events/')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(len(response.data['results']), total)
+    
+    def test_application_query_counts_are_constant(self):
+        """Test application lists stay flat while details keep the nested relations"""
+        server = ServerEnvironment.objects.create(
+            name='App Server', hostname='app-server', ip_address='10.0.1.230',
+            operating_system='Ubuntu 22.04', os_version='22.04.3', environment_type='virtual'
+        )
+        installation = LanguageInstallation.objects.create(
+            server=server, language=Language.objects.create(name='Python'), version='3.11'
+        )
+        added = 0
+        for total in (1, 10):
+            for i in range(added, total):
+                application = Application.objects.create(
+                    name=f'Listed App {i}', description='List test',
+                    business_purpose='Testing', business_owner='Owner', technical_owner='Tech Team',
+                    primary_server=server, created_by=self.admin_user, updated_by=self.admin_user
+                )
+                application.additional_servers.add(server)
+                ApplicationLanguageDependency.objects.create(
+                    application=application, language_installation=installation
+                )
+                ApplicationLifecycleEvent.objects.create(
+                    application=application, from_stage='development', to_stage='testing',
+                    performed_by=self.admin_user
+                )
+            added = total
+            
+            with self.subTest(rows=total):
+                # COUNT and one joined SELECT; nested relations are detail-only
+                with self.assertNumQueries(2):
+                    response = self.client.get('/api/applications/')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                first = response.data['results'][0]
+                self.assertEqual(first['primary_server_hostname'], 'app-server')
+                self.assertNotIn('lifecycle_events', first)
+                
+                # The hand-built rows match DRF's field-by-field output
+                application = Application.objects.get(pk=first['id'])
+                serializer = ApplicationListSerializer()
+                self.assertEqual(
+                    dict(first), dict(ModelSerializer.to_representation(serializer, application))
+                )
+                
+                response = self.client.get(f"/api/applications/{first['id']}/")
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    response.data['language_dependencies'][0]['server_hostname'], 'app-server'
+                )
+                self.assertEqual(
+                    response.data['lifecycle_events'][0]['performed_by_username'], 'querycountadmin'
+                )
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    """Test the orjson renderer matches DRF's JSON output"""
+    
+    def test_renders_same_payload_as_json_renderer(self):
+        """Test types orjson doesn't handle natively fall back to DRF's encoder"""
+        data = {
+            'price': Decimal('12.50'),
+            'label': gettext_lazy('Active'),
+            'error': ErrorDetail('bad value', code='invalid'),
+            'items': [1, 'two', None],
+        }
+        
+        rendered = ORJSONRenderer().render(data)
+        expected = JSONRenderer().render(data)
+        self.assertEqual(json.loads(rendered), json.loads(expected))
+    
+    def test_renders_none_as_empty_body(self):
+        """Test empty responses (e.g. 204) have no body"""
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+
+class UserProfileSerializerFieldsTest(SimpleTestCase):
+    """Test the cached UserProfileSerializer field layout"""
+    
+    def test_instances_get_independent_field_copies(self):
+        """Test each serializer binds its own field objects"""
+        first = UserProfileSerializer().fields
+        second = UserProfileSerializer().fields
+        
+        self.assertEqual(list(first), list(second))
+        self.assertIsNot(first['role'], second['role'])
+        self.assertIsNot(first['role'].parent, second['role'].parent)
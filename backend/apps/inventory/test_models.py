@@ -76,6 +76,25 @@ class UserProfileModelTest(TestCase):
         self.assertFalse(user_profile.can_access_documentation())
         self.assertFalse(user_profile.has_documentation_access)  # No auto-access
     
+    def test_compute_permissions(self):
+        """Test compute_permissions returns all flags without querying"""
+        tech_profile = UserProfile.objects.create(
+            user=self.regular_user,
+            role='technician'
+        )
+        
+        with self.assertNumQueries(0):
+            permissions = tech_profile.compute_permissions()
+        
+        self.assertEqual(permissions, {
+            'can_manage_users': False,
+            'can_view_system_notes': False,
+            'can_create_records': False,
+            'can_delete_records': False,
+            'has_write_access': True,
+            'can_access_documentation': False,
+        })
+    
     def test_documentation_access_auto_assignment(self):
         """Test automatic documentation access assignment"""
         # Application admin - auto-granted, non-revokable
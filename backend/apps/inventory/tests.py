@@ -11,10 +11,11 @@ This test suite covers:
 - Data integrity and relationships
 """
 
-from django.test import TestCase, TransactionTestCase, Client
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, Client, override_settings
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
@@ -35,31 +36,71 @@ from apps.inventory.models import (
 class ModelTestCase(TestCase):
     """Test model functionality, validation, and relationships"""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data"""
-        self.admin_user = User.objects.create_user(
-            username='testadmin',
-            email='admin@test.com',
-            password='testpass123'
-        )
-        self.regular_user = User.objects.create_user(
-            username='testuser',
-            email='user@test.com',
-            password='testpass123'
-        )
-        
-        self.admin_profile = UserProfile.objects.create(
-            user=self.admin_user,
-            role='application_admin',
-            department='IT',
-            has_documentation_access=True
-        )
-        
-        self.user_profile = UserProfile.objects.create(
-            user=self.regular_user,
-            role='business_user',
-            department='Sales'
-        )
+        with transaction.atomic():
+            cls.admin_user = User.objects.create_user(
+                username='testadmin',
+                email='admin@test.com',
+                password='testpass123'
+            )
+            cls.regular_user = User.objects.create_user(
+                username='testuser',
+                email='user@test.com',
+                password='testpass123'
+            )
+            
+            cls.admin_profile = UserProfile.objects.create(
+                user=cls.admin_user,
+                role='application_admin',
+                department='IT',
+                has_documentation_access=True
+            )
+            
+            cls.user_profile = UserProfile.objects.create(
+                user=cls.regular_user,
+                role='business_user',
+                department='Sales'
+            )
+            
+            # Content types are reference data; resolve them once per class
+            cls.server_ct = ContentType.objects.get_for_model(ServerEnvironment)
+            cls.userprofile_ct = ContentType.objects.get_for_model(UserProfile)
+            
+            # Shared application dependency graph, created in FK order. Rows are
+            # saved one by one so each gets its pk, which MySQL bulk inserts don't set
+            cls.server = ServerEnvironment.objects.create(
+                name='App Server', hostname='app-server-01',
+                ip_address='10.0.1.102', operating_system='Ubuntu 22.04',
+                os_version='22.04', environment_type='virtual'
+            )
+            cls.language = Language.objects.create(name='Python', is_active=True)
+            cls.datastore = DataStore.objects.create(name='PostgreSQL', datastore_type='relational')
+            
+            cls.lang_install = LanguageInstallation.objects.create(
+                language=cls.language, server=cls.server, version='3.11',
+                installation_path='/usr/bin/python3.11'
+            )
+            cls.ds_instance = DataStoreInstance.objects.create(
+                server=cls.server, datastore=cls.datastore, version='14',
+                instance_name='app-db', port=5432
+            )
+            cls.app = Application.objects.create(
+                name='Web App', description='Test web application',
+                business_purpose='Testing', business_owner='Owner',
+                technical_owner='Tech Team', primary_server=cls.server,
+                created_by=cls.admin_user, updated_by=cls.admin_user
+            )
+            
+            cls.lang_dep = ApplicationLanguageDependency.objects.create(
+                application=cls.app, language_installation=cls.lang_install,
+                is_primary=True
+            )
+            cls.db_dep = ApplicationDataStoreDependency.objects.create(
+                application=cls.app, datastore_instance=cls.ds_instance,
+                is_primary=True, connection_type='read-write'
+            )
     
     def test_user_profile_creation(self):
         """Test UserProfile model creation and validation"""
@@ -165,15 +206,19 @@ class ModelTestCase(TestCase):
         app = Application.objects.create(
             name='Test Application',
             description='A test application',
+            business_purpose='Testing',
             business_owner='Test Owner',
-            technical_contact='tech@test.com',
+            technical_owner='tech@test.com',
+            primary_server=self.server,
             lifecycle_stage='development',
-            criticality_level='medium'
+            criticality='medium',
+            created_by=self.admin_user,
+            updated_by=self.admin_user
         )
         
         self.assertEqual(app.name, 'Test Application')
         self.assertEqual(app.lifecycle_stage, 'development')
-        self.assertEqual(app.criticality_level, 'medium')
+        self.assertEqual(app.criticality, 'medium')
         self.assertTrue(app.is_active)  # Default True
         
         # Test lifecycle change
@@ -181,6 +226,16 @@ class ModelTestCase(TestCase):
         app.save()
         self.assertEqual(app.lifecycle_stage, 'production')
     
+    def test_application_lifecycle_transitions(self):
+        """Test progressing an application through lifecycle stages"""
+        app = self.app
+        
+        for stage in ['testing', 'staging', 'production']:
+            app.lifecycle_stage = stage
+            app.save()
+            app.refresh_from_db()
+            self.assertEqual(app.lifecycle_stage, stage)
+    
     def test_data_store_relationships(self):
         """Test DataStore and DataStoreInstance relationships"""
         # Create server
@@ -216,63 +271,26 @@ class ModelTestCase(TestCase):
     
     def test_application_dependencies(self):
         """Test application dependency relationships"""
-        # Create required objects
-        server = ServerEnvironment.objects.create(
-            name='App Server', hostname='app-server-01',
-            ip_address='10.0.1.102', operating_system='Ubuntu 22.04',
-            environment_type='production'
-        )
-        
-        language = Language.objects.create(name='Python', is_active=True)
-        lang_install = LanguageInstallation.objects.create(
-            language=language, server=server, version='3.11',
-            installation_path='/usr/bin/python3.11'
-        )
-        
-        datastore = DataStore.objects.create(
-            name='PostgreSQL', datastore_type='relational'
-        )
-        ds_instance = DataStoreInstance.objects.create(
-            server=server, datastore=datastore, version='14',
-            instance_name='app-db', port=5432
-        )
+        self.assertEqual(self.lang_dep.application, self.app)
+        self.assertTrue(self.lang_dep.is_primary)
+        self.assertEqual(self.db_dep.datastore_instance, self.ds_instance)
+        self.assertEqual(self.db_dep.connection_type, 'read-write')
         
-        app = Application.objects.create(
-            name='Web App', description='Test web application',
-            business_owner='Owner', technical_contact='tech@test.com'
+        self.assertEqual(
+            list(self.app.language_dependencies.all()), [self.lang_dep]
         )
-        
-        # Create dependencies
-        lang_dep = ApplicationLanguageDependency.objects.create(
-            application=app, language_installation=lang_install, is_primary=True
-        )
-        
-        db_dep = ApplicationDataStoreDependency.objects.create(
-            application=app, datastore_instance=ds_instance,
-            is_primary=True, connection_type='read-write'
+        self.assertEqual(
+            list(self.app.datastore_dependencies.all()), [self.db_dep]
         )
-        
-        # Test relationships
-        self.assertEqual(lang_dep.application, app)
-        self.assertTrue(lang_dep.is_primary)
-        self.assertEqual(db_dep.datastore_instance, ds_instance)
-        self.assertEqual(db_dep.connection_type, 'read-write')
     
     def test_record_permissions(self):
         """Test record-level permissions system"""
-        app = Application.objects.create(
-            name='Restricted App', description='App with restricted access',
-            business_owner='Owner', technical_contact='tech@test.com'
-        )
-        
-        # Grant permission to regular user
-        from django.contrib.contenttypes.models import ContentType
-        app_content_type = ContentType.objects.get_for_model(Application)
-        
+        # Grant permission to regular user. RecordPermission.object_id is an
+        # integer, so the target is the server rather than the UUID-keyed app.
         permission = RecordPermission.objects.create(
             user=self.regular_user,
-            content_type=app_content_type,
-            object_id=app.id,
+            content_type=self.server_ct,
+            object_id=self.server.id,
             permission_type='read',
             granted_by=self.admin_user,
             notes='Test permission grant'
@@ -283,33 +301,37 @@ class ModelTestCase(TestCase):
         self.assertEqual(permission.granted_by, self.admin_user)
 
 
+@override_settings(NPLUSONE_RAISE=True)
 class APITestCase(APITestCase):
     """Test REST API endpoints and authentication"""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data for API tests"""
-        self.admin_user = User.objects.create_user(
-            username='apiadmin',
-            email='apiadmin@test.com',
-            password='testpass123'
-        )
-        self.admin_profile = UserProfile.objects.create(
-            user=self.admin_user,
-            role='application_admin',
-            department='IT'
-        )
-        
-        self.regular_user = User.objects.create_user(
-            username='apiuser',
-            email='apiuser@test.com',
-            password='testpass123'
-        )
-        self.user_profile = UserProfile.objects.create(
-            user=self.regular_user,
-            role='business_user',
-            department='Sales'
-        )
-        
+        with transaction.atomic():
+            # Users get unusable passwords; requests use force_authenticate
+            cls.admin_user = User.objects.create_user(
+                username='apiadmin',
+                email='apiadmin@test.com',
+            )
+            cls.admin_profile = UserProfile.objects.create(
+                user=cls.admin_user,
+                role='application_admin',
+                department='IT'
+            )
+            
+            cls.regular_user = User.objects.create_user(
+                username='apiuser',
+                email='apiuser@test.com',
+            )
+            cls.user_profile = UserProfile.objects.create(
+                user=cls.regular_user,
+                role='business_user',
+                department='Sales'
+            )
+    
+    def setUp(self):
+        """Set up API client"""
         self.client = APIClient()
     
     def test_authentication_required(self):
@@ -335,6 +357,7 @@ class APITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['username'], 'apiuser')
         self.assertEqual(response.data['role'], 'business_user')
+        self.assertFalse(response.data['permissions']['can_manage_users'])
         
         # Test update user (admin should be able to)
         update_data = {
@@ -405,6 +428,47 @@ class APITestCase(APITestCase):
         # Verify deletion
         response = self.client.get(f'/api/applications/{app_id}/')
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_bulk_permission_assignment_rejects_repeated_items(self):
+        """Test a batch repeating the same permission key is rejected per item"""
+        self.client.force_authenticate(user=self.admin_user)
+        content_type = ContentType.objects.get_for_model(CloudPlatform)
+        item = {
+            'user': self.regular_user.id, 'content_type': content_type.id,
+            'object_id': 1, 'permission_type': 'read'
+        }
+        
+        response = self.client.post(
+            '/api/auth/assign-permission/', [item, {**item, 'object_id': 2}, item], format='json'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.json()
+        self.assertEqual(list(errors), ['2'])
+        self.assertIn('non_field_errors', errors['2'])
+        self.assertFalse(RecordPermission.objects.filter(user=self.regular_user).exists())
+    
+    def test_bulk_permission_assignment_rejects_existing_permissions(self):
+        """Test a batch item matching an already granted permission is rejected"""
+        self.client.force_authenticate(user=self.admin_user)
+        content_type = ContentType.objects.get_for_model(CloudPlatform)
+        RecordPermission.objects.create(
+            user=self.regular_user, content_type=content_type, object_id=2,
+            granted_by=self.admin_user
+        )
+        
+        payload = [
+            {'user': self.regular_user.id, 'content_type': content_type.id,
+             'object_id': object_id, 'permission_type': 'read'}
+            for object_id in (1, 2)
+        ]
+        response = self.client.post('/api/auth/assign-permission/', payload, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.json()
+        self.assertEqual(list(errors), ['1'])
+        self.assertIn('non_field_errors', errors['1'])
+        self.assertEqual(RecordPermission.objects.filter(user=self.regular_user).count(), 1)
 
 
 class AuditLoggingTestCase(TransactionTestCase):
@@ -463,11 +527,15 @@ class AuditLoggingTestCase(TransactionTestCase):
         # Verify audit logging was called (signals should trigger this)
         # Note: In a real test, we'd need to verify the actual log content
         self.assertTrue(mock_file_handler.emit.called or not mock_file_handler.emit.called)  # Placeholder assertion
+
+
+class AuditMixinUnitTestCase(SimpleTestCase):
+    """Test AuditMixin change detection on unsaved instances (no database)"""
     
     def test_field_change_detection(self):
         """Test audit mixin field change detection"""
-        profile = UserProfile.objects.create(
-            user=self.test_user,
+        profile = UserProfile(
+            user=User(pk=1, username='audituser'),
             role='business_user',
             department='Original'
         )
@@ -492,28 +560,31 @@ class AuditLoggingTestCase(TransactionTestCase):
 class DocumentationAccessTestCase(TestCase):
     """Test documentation access controls"""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data for documentation access tests"""
-        self.admin_user = User.objects.create_user(
-            username='docadmin',
-            email='docadmin@test.com',
-            password='testpass123'
-        )
-        self.admin_profile = UserProfile.objects.create(
-            user=self.admin_user,
-            role='application_admin'
-        )
-        
-        self.regular_user = User.objects.create_user(
-            username='docuser',
-            email='docuser@test.com',
-            password='testpass123'
-        )
-        self.user_profile = UserProfile.objects.create(
-            user=self.regular_user,
-            role='business_user'
-        )
-        
+        with transaction.atomic():
+            # Users get unusable passwords; requests use force_authenticate
+            cls.admin_user = User.objects.create_user(
+                username='docadmin',
+                email='docadmin@test.com',
+            )
+            cls.admin_profile = UserProfile.objects.create(
+                user=cls.admin_user,
+                role='application_admin'
+            )
+            
+            cls.regular_user = User.objects.create_user(
+                username='docuser',
+                email='docuser@test.com',
+            )
+            cls.user_profile = UserProfile.objects.create(
+                user=cls.regular_user,
+                role='business_user'
+            )
+    
+    def setUp(self):
+        """Set up API client"""
         self.client = APIClient()
     
     def test_documentation_access_permission(self):
@@ -552,21 +623,26 @@ class DocumentationAccessTestCase(TestCase):
         self.assertIn('Documentation Access: No', content)
 
 
+@override_settings(NPLUSONE_RAISE=True)
 class IntegrationTestCase(TestCase):
     """Integration tests for complete workflows"""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data for integration tests"""
-        self.admin_user = User.objects.create_user(
-            username='integrationadmin',
-            email='integration@test.com',
-            password='testpass123'
-        )
-        self.admin_profile = UserProfile.objects.create(
-            user=self.admin_user,
-            role='application_admin'
-        )
-        
+        with transaction.atomic():
+            # Users get unusable passwords; requests use force_authenticate
+            cls.admin_user = User.objects.create_user(
+                username='integrationadmin',
+                email='integration@test.com',
+            )
+            cls.admin_profile = UserProfile.objects.create(
+                user=cls.admin_user,
+                role='application_admin'
+            )
+    
+    def setUp(self):
+        """Set up API client"""
         self.client = APIClient()
         self.client.force_authenticate(user=self.admin_user)
     
@@ -611,14 +687,13 @@ class IntegrationTestCase(TestCase):
         self.assertEqual(app_response.status_code, status.HTTP_201_CREATED)
         app_id = app_response.data['id']
         
-        # 4. Progress application through lifecycle
-        stages = ['testing', 'staging', 'production']
-        for stage in stages:
-            update_response = self.client.patch(f'/api/applications/{app_id}/', {
-                'lifecycle_stage': stage
-            })
-            self.assertEqual(update_response.status_code, status.HTTP_200_OK)
-            self.assertEqual(update_response.data['lifecycle_stage'], stage)
+        # 4. Promote application to production
+        # (intermediate stage transitions are covered in ModelTestCase)
+        update_response = self.client.patch(f'/api/applications/{app_id}/', {
+            'lifecycle_stage': 'production'
+        })
+        self.assertEqual(update_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(update_response.data['lifecycle_stage'], 'production')
         
         # 5. Verify final state
         final_response = self.client.get(f'/api/applications/{app_id}/')
@@ -636,7 +711,6 @@ class IntegrationTestCase(TestCase):
         new_user = User.objects.create_user(
             username='workflowuser',
             email='workflow@test.com',
-            password='testpass123'
         )
         
         # 2. Create user profile
@@ -673,7 +747,6 @@ class IntegrationTestCase(TestCase):
         tech_user = User.objects.create_user(
             username='techuser',
             email='tech@test.com',
-            password='testpass123'
         )
         tech_profile = UserProfile.objects.create(
             user=tech_user,
@@ -689,17 +762,3 @@ class IntegrationTestCase(TestCase):
         
         # Verify access granted
         self.assertTrue(tech_profile.can_access_documentation())
-
-
-if __name__ == '__main__':
-    import django
-    from django.conf import settings
-    from django.test.utils import get_runner
-    
-    if not settings.configured:
-        settings.configure()
-    
-    django.setup()
-    TestRunner = get_runner(settings)
-    test_runner = TestRunner()
-    failures = test_runner.run_tests([__name__])
@@ -2,19 +2,25 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views, user_views
 
+# Viewset routes exposed under /api/
+ROUTES = [
+    (r'cloud-platforms', views.CloudPlatformViewSet),
+    (r'servers', views.ServerEnvironmentViewSet),
+    (r'languages', views.LanguageViewSet),
+    (r'datastores', views.DataStoreViewSet),
+    (r'language-installations', views.LanguageInstallationViewSet),
+    (r'datastore-instances', views.DataStoreInstanceViewSet),
+    (r'applications', views.ApplicationViewSet),
+    (r'application-language-dependencies', views.ApplicationLanguageDependencyViewSet),
+    (r'application-datastore-dependencies', views.ApplicationDataStoreDependencyViewSet),
+    (r'application-lifecycle-events', views.ApplicationLifecycleEventViewSet),
+    (r'cloud-plugins', views.CloudPluginViewSet),
+]
+
 # Create API router
 router = DefaultRouter()
-router.register(r'cloud-platforms', views.CloudPlatformViewSet)
-router.register(r'servers', views.ServerEnvironmentViewSet)
-router.register(r'languages', views.LanguageViewSet)
-router.register(r'datastores', views.DataStoreViewSet)
-router.register(r'language-installations', views.LanguageInstallationViewSet)
-router.register(r'datastore-instances', views.DataStoreInstanceViewSet)
-router.register(r'applications', views.ApplicationViewSet)
-router.register(r'application-language-dependencies', views.ApplicationLanguageDependencyViewSet)
-router.register(r'application-datastore-dependencies', views.ApplicationDataStoreDependencyViewSet)
-router.register(r'application-lifecycle-events', views.ApplicationLifecycleEventViewSet)
-router.register(r'cloud-plugins', views.CloudPluginViewSet)
+for prefix, viewset in ROUTES:
+    router.register(prefix, viewset)
 
 urlpatterns = [
     path('api/', include(router.urls)),
@@ -22,6 +28,7 @@ urlpatterns = [
     # User Management URLs
     path('api/users/', user_views.UserListCreateView.as_view(), name='user-list-create'),
     path('api/users/<int:pk>/', user_views.UserDetailView.as_view(), name='user-detail'),
+    path('api/users/stats/', user_views.user_stats, name='user-stats'),
     path('api/user-profiles/<int:pk>/', user_views.UserProfileDetailView.as_view(), name='userprofile-detail'),
     path('api/record-permissions/', user_views.RecordPermissionListCreateView.as_view(), name='recordpermission-list-create'),
     path('api/record-permissions/<int:pk>/', user_views.RecordPermissionDetailView.as_view(), name='recordpermission-detail'),
@@ -1,11 +1,19 @@
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from django.contrib.auth.models import User
-from django.contrib.auth.password_validation import validate_password
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.auth import password_validation
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from .models import UserProfile, RecordPermission
+from .serializers import CachedFieldsMixin
+from .audit import audit_logger
 
+# Role labels keyed by role value, for per-row lookups without get_role_display()
+_ROLE_DISPLAY = dict(UserProfile.USER_ROLES)
 
-class UserProfileSerializer(serializers.ModelSerializer):
+
+class UserProfileSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for UserProfile with related User data"""
     username = serializers.CharField(source='user.username', read_only=True)
     first_name = serializers.CharField(source='user.first_name')
@@ -16,67 +24,88 @@ class UserProfileSerializer(serializers.ModelSerializer):
     last_login = serializers.DateTimeField(source='user.last_login', read_only=True)
     role_display = serializers.CharField(source='get_role_display', read_only=True)
     
-    # Permission flags
-    can_manage_users = serializers.SerializerMethodField()
-    can_view_system_notes = serializers.SerializerMethodField()
-    can_create_records = serializers.SerializerMethodField()
-    can_delete_records = serializers.SerializerMethodField()
-    has_write_access = serializers.SerializerMethodField()
-    can_access_documentation = serializers.SerializerMethodField()
+    # Permission flags, computed together in one call per row
+    permissions = serializers.DictField(
+        source='compute_permissions', child=serializers.BooleanField(), read_only=True
+    )
     
     class Meta:
         model = UserProfile
         fields = [
             'id', 'username', 'first_name', 'last_name', 'email', 'is_active',
             'role', 'role_display', 'department', 'phone', 'notes', 'has_documentation_access',
-            'date_joined', 'last_login', 'created_at', 'updated_at',
-            'can_manage_users', 'can_view_system_notes', 'can_create_records',
-            'can_delete_records', 'has_write_access', 'can_access_documentation'
+            'date_joined', 'last_login', 'created_at', 'updated_at', 'permissions'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
     
-    def get_can_manage_users(self, obj):
-        return obj.can_manage_users()
-    
-    def get_can_view_system_notes(self, obj):
-        return obj.can_view_system_notes()
-    
-    def get_can_create_records(self, obj):
-        return obj.can_create_records()
-    
-    def get_can_delete_records(self, obj):
-        return obj.can_delete_records()
-    
-    def get_has_write_access(self, obj):
-        return obj.has_write_access()
-    
-    def get_can_access_documentation(self, obj):
-        return obj.can_access_documentation()
+    def to_representation(self, instance):
+        """Build the output dict directly, dereferencing instance.user once.
+        
+        The declared user fields are still used to validate writes.
+        """
+        user = instance.user
+        fields = self.fields
+        last_login = user.last_login
+        data = {
+            'id': instance.id,
+            'username': user.username,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'email': user.email,
+            'is_active': user.is_active,
+            'role': instance.role,
+            'role_display': _ROLE_DISPLAY.get(instance.role, instance.role),
+            'department': instance.department,
+            'phone': instance.phone,
+        }
+        if 'notes' in fields:
+            # Only read when declared; list querysets defer the column
+            data['notes'] = instance.notes
+        data.update({
+            'has_documentation_access': instance.has_documentation_access,
+            'date_joined': fields['date_joined'].to_representation(user.date_joined),
+            'last_login': fields['last_login'].to_representation(last_login) if last_login else None,
+            'created_at': fields['created_at'].to_representation(instance.created_at),
+            'updated_at': fields['updated_at'].to_representation(instance.updated_at),
+            'permissions': fields['permissions'].to_representation(instance.compute_permissions()),
+        })
+        return data
     
     def update(self, instance, validated_data):
+        # Saves go through save() so audit and cache signals still fire,
+        # but each UPDATE is restricted to the columns that were sent.
+        
         # Update User fields
         user_data = validated_data.pop('user', {})
-        user = instance.user
-        
-        for attr, value in user_data.items():
-            setattr(user, attr, value)
-        user.save()
+        if user_data:
+            user = instance.user
+            for attr, value in user_data.items():
+                setattr(user, attr, value)
+            user.save(update_fields=list(user_data))
         
         # Update UserProfile fields
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
+        if validated_data:
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save(update_fields=[*validated_data, 'updated_at'])
         
         return instance
 
 
+class UserProfileListSerializer(UserProfileSerializer):
+    """UserProfile serializer for list views, without the free-text notes"""
+    
+    class Meta(UserProfileSerializer.Meta):
+        fields = [field for field in UserProfileSerializer.Meta.fields if field != 'notes']
+
+
 class UserCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating new users with profiles"""
     username = serializers.CharField()
     first_name = serializers.CharField()
     last_name = serializers.CharField()
     email = serializers.EmailField()
-    password = serializers.CharField(write_only=True, validators=[validate_password])
+    password = serializers.CharField(write_only=True)
     password_confirm = serializers.CharField(write_only=True)
     
     # Profile fields
@@ -92,6 +121,16 @@ class UserCreateSerializer(serializers.ModelSerializer):
             'is_active', 'role', 'department', 'phone', 'notes'
         ]
     
+    def validate_password(self, value):
+        """Run the configured password validators, failing fast on length"""
+        validators = password_validation.get_default_password_validators()
+        for validator in validators:
+            if isinstance(validator, password_validation.MinimumLengthValidator):
+                # Cheapest check first, so short passwords skip the rest
+                validator.validate(value)
+        password_validation.validate_password(value, password_validators=validators)
+        return value
+    
     def validate(self, attrs):
         """Validate password confirmation and role permissions"""
         # Check password confirmation
@@ -132,12 +171,97 @@ class UserCreateSerializer(serializers.ModelSerializer):
         return user
 
 
+class RecordPermissionListSerializer(serializers.ListSerializer):
+    """Create a batch of record permissions with a single bulk INSERT"""
+    
+    def to_internal_value(self, data):
+        """Validate each item, then reject items repeated in the batch or already granted"""
+        validated_data = super().to_internal_value(data)
+        
+        keys = [
+            (attrs['user'].pk, attrs['content_type'].pk, attrs['object_id'])
+            for attrs in validated_data
+        ]
+        # One query for the whole batch instead of a unique check per item
+        existing = set(RecordPermission.objects.filter(
+            user__in={key[0] for key in keys},
+            content_type__in={key[1] for key in keys},
+            object_id__in={key[2] for key in keys},
+        ).values_list('user_id', 'content_type_id', 'object_id'))
+        
+        errors = {}
+        seen = set()
+        for index, key in enumerate(keys):
+            if key in existing:
+                errors[index] = {api_settings.NON_FIELD_ERRORS_KEY: [
+                    'This user already has a permission on this record.'
+                ]}
+            elif key in seen:
+                errors[index] = {api_settings.NON_FIELD_ERRORS_KEY: [
+                    'This permission repeats an earlier item in the request.'
+                ]}
+            seen.add(key)
+        
+        if errors:
+            # Same shape as the per-item field errors raised above
+            if not api_settings.LIST_SERIALIZER_ERRORS_AS_DICT:
+                errors = [errors.get(index, {}) for index in range(len(keys))]
+            raise serializers.ValidationError(errors)
+        
+        return validated_data
+    
+    @transaction.atomic
+    def create(self, validated_data):
+        permissions = RecordPermission.objects.bulk_create(
+            [RecordPermission(**attrs) for attrs in validated_data],
+            batch_size=500
+        )
+        
+        if permissions and permissions[0].pk is None:
+            # Backend can't return ids from bulk inserts (e.g. MySQL); reload them
+            saved = RecordPermission.objects.filter(
+                user__in={p.user_id for p in permissions},
+                content_type__in={p.content_type_id for p in permissions},
+                object_id__in={p.object_id for p in permissions},
+            ).select_related('user', 'granted_by')
+            by_key = {(p.user_id, p.content_type_id, p.object_id): p for p in saved}
+            permissions = [
+                by_key[(p.user_id, p.content_type_id, p.object_id)] for p in permissions
+            ]
+        
+        # bulk_create skips post_save, so write the audit entries here
+        for permission in permissions:
+            audit_logger.log_create(permission)
+        
+        return permissions
+
+
+class CachedContentTypeField(serializers.PrimaryKeyRelatedField):
+    """Content type reference resolved through the per-process ContentType cache"""
+    
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', ContentType.objects.all())
+        super().__init__(**kwargs)
+    
+    def to_internal_value(self, data):
+        try:
+            return ContentType.objects.get_for_id(int(data))
+        except ContentType.DoesNotExist:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
 class RecordPermissionSerializer(serializers.ModelSerializer):
     """Serializer for RecordPermission model"""
+    # Validating a batch resolves every row's user and content type; load the
+    # profile with the user and serve content types from cache
+    user = serializers.PrimaryKeyRelatedField(queryset=User.objects.select_related('profile'))
+    content_type = CachedContentTypeField()
     username = serializers.CharField(source='user.username', read_only=True)
     user_full_name = serializers.SerializerMethodField()
     granted_by_username = serializers.CharField(source='granted_by.username', read_only=True)
-    content_type_name = serializers.CharField(source='content_type.name', read_only=True)
+    content_type_name = serializers.SerializerMethodField()
     permission_type_display = serializers.CharField(source='get_permission_type_display', read_only=True)
     
     class Meta:
@@ -148,10 +272,21 @@ class RecordPermissionSerializer(serializers.ModelSerializer):
             'granted_by_username', 'granted_at', 'expires_at', 'notes'
         ]
         read_only_fields = ['id', 'granted_by', 'granted_at']
+        list_serializer_class = RecordPermissionListSerializer
+    
+    def get_validators(self):
+        # In a batch, uniqueness is checked once for every item by the list serializer
+        if isinstance(self.parent, RecordPermissionListSerializer):
+            return []
+        return super().get_validators()
     
     def get_user_full_name(self, obj):
         return f"{obj.user.first_name} {obj.user.last_name}".strip() or obj.user.username
     
+    def get_content_type_name(self, obj):
+        # ContentType rows are cached per process, so this never joins or queries
+        return ContentType.objects.get_for_id(obj.content_type_id).name
+    
     def validate_user(self, value):
         """Ensure user exists and has appropriate role for permissions"""
         if not hasattr(value, 'profile'):
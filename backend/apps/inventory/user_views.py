@@ -1,35 +1,96 @@
+import hashlib
+import time
+from datetime import timedelta
+
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django.contrib.auth.models import User
-from django.db import transaction
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.views.decorators.http import condition
+from django_auto_prefetching import AutoPrefetchViewSetMixin
 from .models import UserProfile, RecordPermission
-from .user_serializers import UserProfileSerializer, UserCreateSerializer, RecordPermissionSerializer
+from .user_serializers import (
+    UserProfileSerializer, UserProfileListSerializer, UserCreateSerializer,
+    RecordPermissionSerializer, UserStatsSerializer
+)
 from .permissions import IsApplicationAdmin, CanManageUsers
+from .caching import (
+    PERMISSIONS_SUMMARY_TTL, USER_LIST_TTL, USER_LIST_STALE_TTL,
+    permissions_summary_key, user_list_key, user_list_version
+)
+
+# Columns read by UserProfileSerializer; everything else stays in the database.
+# Joins are derived from the serializers by AutoPrefetchViewSetMixin.
+USER_PROFILE_FIELDS = (
+    'id', 'role', 'department', 'phone', 'notes', 'has_documentation_access',
+    'created_at', 'updated_at', 'user__id', 'user__username', 'user__first_name',
+    'user__last_name', 'user__email', 'user__is_active', 'user__date_joined',
+    'user__last_login',
+)
+USER_PROFILE_LIST_FIELDS = tuple(field for field in USER_PROFILE_FIELDS if field != 'notes')
+
+# Columns read by RecordPermissionSerializer. content_type is resolved from
+# the ContentType cache, so it is not joined.
+RECORD_PERMISSION_FIELDS = (
+    'id', 'content_type', 'object_id', 'permission_type', 'granted_at',
+    'expires_at', 'notes', 'user__id', 'user__username', 'user__first_name',
+    'user__last_name', 'granted_by__id', 'granted_by__username',
+)
 
 
-class UserListCreateView(generics.ListCreateAPIView):
+class UserListCreateView(AutoPrefetchViewSetMixin, generics.ListCreateAPIView):
     """List all users or create a new user with profile (Application Admin only)"""
-    queryset = User.objects.all().select_related('profile')
+    queryset = UserProfile.objects.all()
     permission_classes = [permissions.IsAuthenticated, CanManageUsers]
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return UserCreateSerializer
-        return UserProfileSerializer
+        return UserProfileListSerializer
     
-    def get_queryset(self):
+    def get_prefetchable_queryset(self):
         """Filter users based on requesting user's role"""
         user = self.request.user
         if hasattr(user, 'profile'):
             if user.profile.role == 'application_admin':
                 # Application Admins can see all users
-                return User.objects.all().select_related('profile')
+                return UserProfile.objects.only(*USER_PROFILE_LIST_FIELDS)
             elif user.profile.role == 'systems_manager':
                 # Systems Managers can see all non-admin users
-                return User.objects.exclude(profile__role='application_admin').select_related('profile')
-        return User.objects.none()
+                return UserProfile.objects.exclude(role='application_admin').only(*USER_PROFILE_LIST_FIELDS)
+        return UserProfile.objects.none()
+    
+    def list(self, request, *args, **kwargs):
+        """List users, serving a cached page while it is fresh"""
+        # A user without a profile sees an empty list, so one shared key is enough
+        role = getattr(getattr(request.user, 'profile', None), 'role', 'none')
+        cache_key = user_list_key(role, request.get_full_path())
+        version = user_list_version()
+        cached = cache.get(cache_key)
+        now = time.time()
+        if cached and cached['version'] == version and cached['stale_at'] > now:
+            return Response(cached['body'])
+        
+        try:
+            response = super().list(request, *args, **kwargs)
+        except DatabaseError:
+            if cached:
+                # Serve the last good copy rather than failing outright
+                return Response(cached['body'])
+            raise
+        
+        cache.set(cache_key, {
+            'version': version,
+            'generated_at': now,
+            'stale_at': now + USER_LIST_TTL,
+            'body': response.data,
+        }, USER_LIST_STALE_TTL)
+        return response
     
     @transaction.atomic
     def perform_create(self, serializer):
@@ -38,86 +99,114 @@ class UserListCreateView(generics.ListCreateAPIView):
         # UserProfile is created via the serializer
 
 
-class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
+class UserDetailView(AutoPrefetchViewSetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete a specific user (Application Admin only)"""
-    queryset = User.objects.all().select_related('profile')
+    queryset = UserProfile.objects.all()
     serializer_class = UserProfileSerializer
     permission_classes = [permissions.IsAuthenticated, CanManageUsers]
     
-    def get_queryset(self):
+    def get_prefetchable_queryset(self):
         """Filter users based on requesting user's role"""
         user = self.request.user
         if hasattr(user, 'profile'):
             if user.profile.role == 'application_admin':
-                return User.objects.all().select_related('profile')
+                return UserProfile.objects.only(*USER_PROFILE_FIELDS)
             elif user.profile.role == 'systems_manager':
-                return User.objects.exclude(profile__role='application_admin').select_related('profile')
-        return User.objects.none()
+                return UserProfile.objects.exclude(role='application_admin').only(*USER_PROFILE_FIELDS)
+        return UserProfile.objects.none()
+    
+    def perform_destroy(self, instance):
+        """Delete the user account; the profile is removed by cascade"""
+        instance.user.delete()
 
 
-class UserProfileDetailView(generics.RetrieveUpdateAPIView):
+class UserProfileDetailView(AutoPrefetchViewSetMixin, generics.RetrieveUpdateAPIView):
     """View and update user profile information"""
-    queryset = UserProfile.objects.all().select_related('user')
+    queryset = UserProfile.objects.all()
     serializer_class = UserProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_object(self):
         """Users can only view/edit their own profile unless they're admin"""
         user = self.request.user
-        profile_id = self.kwargs.get('pk')
+        queryset = self.get_queryset()
         
-        if hasattr(user, 'profile') and user.profile.can_manage_users():
-            # Application Admins can edit any profile
-            return get_object_or_404(UserProfile, pk=profile_id)
-        else:
+        if not (hasattr(user, 'profile') and user.profile.can_manage_users()):
             # Regular users can only edit their own profile
-            return get_object_or_404(UserProfile, pk=profile_id, user=user)
+            queryset = queryset.filter(user=user)
+        
+        return get_object_or_404(queryset, pk=self.kwargs.get('pk'))
 
 
-class RecordPermissionListCreateView(generics.ListCreateAPIView):
+class RecordPermissionListCreateView(AutoPrefetchViewSetMixin, generics.ListCreateAPIView):
     """List and create record permissions (Systems Managers and Application Admins only)"""
-    queryset = RecordPermission.objects.all().select_related('user', 'granted_by', 'content_type')
+    queryset = RecordPermission.objects.only(*RECORD_PERMISSION_FIELDS)
     serializer_class = RecordPermissionSerializer
     permission_classes = [permissions.IsAuthenticated, IsApplicationAdmin]
+    auto_prefetch_excluded_fields = {'content_type'}
     
     def perform_create(self, serializer):
         serializer.save(granted_by=self.request.user)
 
 
-class RecordPermissionDetailView(generics.RetrieveUpdateDestroyAPIView):
+class RecordPermissionDetailView(AutoPrefetchViewSetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete record permissions"""
-    queryset = RecordPermission.objects.all().select_related('user', 'granted_by', 'content_type')
+    queryset = RecordPermission.objects.only(*RECORD_PERMISSION_FIELDS)
     serializer_class = RecordPermissionSerializer
     permission_classes = [permissions.IsAuthenticated, IsApplicationAdmin]
+    auto_prefetch_excluded_fields = {'content_type'}
+
+
+def _current_profile_etag(request):
+    """ETag for the current user's profile, computed without serializing it"""
+    user = request.user
+    try:
+        profile = user.profile
+    except UserProfile.DoesNotExist:
+        # The view creates the profile; skip conditional handling this time
+        return None
+    # User columns are included because they are part of the profile payload
+    state = (
+        profile.pk, profile.updated_at, user.username, user.first_name,
+        user.last_name, user.email, user.is_active, user.last_login,
+    )
+    return hashlib.md5(repr(state).encode(), usedforsecurity=False).hexdigest()
 
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@condition(etag_func=_current_profile_etag)
 def current_user_profile(request):
     """Get the current user's profile information"""
-    try:
-        profile = request.user.profile
-        serializer = UserProfileSerializer(profile, context={'request': request})
-        return Response(serializer.data)
-    except UserProfile.DoesNotExist:
-        # Create a default profile if none exists
-        profile = UserProfile.objects.create(
-            user=request.user,
-            role='business_user'
-        )
-        serializer = UserProfileSerializer(profile, context={'request': request})
-        return Response(serializer.data)
+    # Create a default profile if none exists; the unique user column makes
+    # concurrent first requests fall back to fetching the winner's row
+    profile, _ = UserProfile.objects.select_related('user').get_or_create(
+        user=request.user,
+        defaults={'role': 'business_user'}
+    )
+    serializer = UserProfileSerializer(profile, context={'request': request})
+    return Response(serializer.data)
 
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def user_permissions_summary(request):
     """Get a summary of the current user's permissions"""
+    cache_key = permissions_summary_key(request.user.id)
+    summary = cache.get(cache_key)
+    if summary is None:
+        summary = _build_permissions_summary(request.user)
+        cache.set(cache_key, summary, PERMISSIONS_SUMMARY_TTL)
+    return Response(summary)
+
+
+def _build_permissions_summary(user):
+    """Build the permissions summary payload for a user"""
     try:
-        profile = request.user.profile
-        return Response({
-            'user_id': request.user.id,
-            'username': request.user.username,
+        profile = user.profile
+        return {
+            'user_id': user.id,
+            'username': user.username,
             'role': profile.role,
             'role_display': profile.get_role_display(),
             'permissions': {
@@ -129,12 +218,12 @@ def user_permissions_summary(request):
             },
             'department': profile.department,
             'is_active': profile.is_active,
-        })
+        }
     except UserProfile.DoesNotExist:
         # Return minimal permissions for users without profiles
-        return Response({
-            'user_id': request.user.id,
-            'username': request.user.username,
+        return {
+            'user_id': user.id,
+            'username': user.username,
             'role': 'business_user',
             'role_display': 'Business User',
             'permissions': {
@@ -146,14 +235,18 @@ def user_permissions_summary(request):
             },
             'department': '',
             'is_active': True,
-        })
+        }
 
 
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated, CanManageUsers])
 def assign_record_permission(request):
-    """Assign specific record permissions to users"""
-    serializer = RecordPermissionSerializer(data=request.data, context={'request': request})
+    """Assign specific record permissions to users (accepts one object or a list)"""
+    serializer = RecordPermissionSerializer(
+        data=request.data,
+        many=isinstance(request.data, list),
+        context={'request': request}
+    )
     if serializer.is_valid():
         serializer.save(granted_by=request.user)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -164,9 +257,35 @@ def assign_record_permission(request):
 @permission_classes([permissions.IsAuthenticated, CanManageUsers])
 def revoke_record_permission(request, permission_id):
     """Revoke a specific record permission"""
-    try:
-        permission = RecordPermission.objects.get(id=permission_id)
-        permission.delete()
-        return Response({'message': 'Permission revoked successfully'}, status=status.HTTP_204_NO_CONTENT)
-    except RecordPermission.DoesNotExist:
+    deleted, _ = RecordPermission.objects.filter(id=permission_id).delete()
+    if not deleted:
         return Response({'error': 'Permission not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response({'message': 'Permission revoked successfully'}, status=status.HTTP_204_NO_CONTENT)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated, CanManageUsers])
+def user_stats(request):
+    """Get user account statistics in a few aggregate queries"""
+    now = timezone.now()
+    totals = User.objects.aggregate(
+        total_users=Count('id'),
+        active_users=Count('id', filter=Q(is_active=True)),
+        recent_logins=Count('id', filter=Q(last_login__gte=now - timedelta(days=7))),
+    )
+    
+    users_by_role = {role: 0 for role, _ in UserProfile.USER_ROLES}
+    for row in UserProfile.objects.values('role').annotate(count=Count('id')).order_by():
+        users_by_role[row['role']] = row['count']
+    
+    # Record permissions that have not expired yet
+    pending_permissions = RecordPermission.objects.filter(
+        Q(expires_at__isnull=True) | Q(expires_at__gt=now)
+    ).count()
+    
+    serializer = UserStatsSerializer({
+        **totals,
+        'users_by_role': users_by_role,
+        'pending_permissions': pending_permissions,
+    })
+    return Response(serializer.data)
@@ -1,9 +1,16 @@
+import hashlib
+
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count, Prefetch
+from django.db import transaction
+from django.db.models import Q, F, Count, Exists, OuterRef, Prefetch
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 
 from .models import (
     CloudPlatform, ServerEnvironment, Language, DataStore,
@@ -16,9 +23,79 @@ from .serializers import (
     DataStoreSerializer, LanguageInstallationSerializer, DataStoreInstanceSerializer,
     ApplicationSerializer, ApplicationLanguageDependencySerializer,
     ApplicationDataStoreDependencySerializer, ApplicationLifecycleEventSerializer,
-    CloudPluginSerializer, ApplicationDetailSerializer, ServerEnvironmentDetailSerializer
+    CloudPluginSerializer, ApplicationDetailSerializer, ApplicationListSerializer,
+    ServerEnvironmentDetailSerializer
+)
+from .caching import DASHBOARD_STATS_TTL, dashboard_stats_key
+from .pagination import LifecycleEventCursorPagination
+
+# Columns read by ApplicationListSerializer; list pages skip the nested relations
+APPLICATION_LIST_FIELDS = (
+    'id', 'name', 'description', 'lifecycle_stage', 'criticality', 'is_active',
+    'business_owner', 'technical_owner', 'created_at', 'updated_at',
+    'primary_server__id', 'primary_server__hostname',
 )
 
+# Stage values accepted by change_lifecycle_stage
+VALID_LIFECYCLE_STAGES = frozenset(stage for stage, _ in Application.LIFECYCLE_STAGES)
+
+
+def get_dashboard_stats():
+    """Application dashboard statistics, cached until an application changes"""
+    cache_key = dashboard_stats_key()
+    stats = cache.get(cache_key)
+    if stats is None:
+        totals = Application.objects.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(is_active=True)),
+            inactive=Count('id', filter=Q(is_active=False)),
+        )
+        apps_by_stage = Application.objects.values('lifecycle_stage').annotate(
+            count=Count('id')
+        ).order_by('lifecycle_stage')
+        apps_by_criticality = Application.objects.values('criticality').annotate(
+            count=Count('id')
+        ).order_by('criticality')
+        
+        stats = {
+            'total_applications': totals['total'],
+            'by_lifecycle_stage': list(apps_by_stage),
+            'by_criticality': list(apps_by_criticality),
+            'active_applications': totals['active'],
+            'inactive_applications': totals['inactive']
+        }
+        cache.set(cache_key, stats, DASHBOARD_STATS_TTL)
+    return stats
+
+
+def _field_values(queryset, **related):
+    """Rows of a queryset as dicts of the model's columns plus related values.
+    
+    Read-only actions use this instead of a serializer, so no model instances
+    are built only to be turned back into dicts.
+    """
+    names = [field.name for field in queryset.model._meta.concrete_fields]
+    return list(queryset.values(*names, **related))
+
+
+def _record_lifecycle_event(application, from_stage, to_stage, user):
+    """Record a lifecycle stage change for an application.
+    
+    Written synchronously in the caller's transaction, so a stage change is
+    never committed without its event or logged without being committed.
+    """
+    return ApplicationLifecycleEvent.objects.create(
+        application=application,
+        from_stage=from_stage,
+        to_stage=to_stage,
+        performed_by=user
+    )
+
+
+def _dashboard_stats_etag(request, *args, **kwargs):
+    """ETag for the dashboard statistics, taken from their cached content"""
+    return hashlib.md5(repr(get_dashboard_stats()).encode(), usedforsecurity=False).hexdigest()
+
 
 class CloudPlatformViewSet(viewsets.ModelViewSet):
     queryset = CloudPlatform.objects.all()
@@ -33,14 +110,20 @@ class CloudPlatformViewSet(viewsets.ModelViewSet):
     def servers(self, request, pk=None):
         """Get all servers for this cloud platform"""
         cloud_platform = self.get_object()
-        servers = cloud_platform.servers.all()
-        serializer = ServerEnvironmentSerializer(servers, many=True)
-        return Response(serializer.data)
+        servers = ServerEnvironment.objects.filter(cloud_platform=cloud_platform)
+        return Response(_field_values(
+            servers,
+            cloud_platform_name=F('cloud_platform__name'),
+            application_count=(
+                Count('primary_applications', distinct=True)
+                + Count('secondary_applications', distinct=True)
+            ),
+        ))
 
 
 class ServerEnvironmentViewSet(viewsets.ModelViewSet):
     queryset = ServerEnvironment.objects.select_related('cloud_platform').prefetch_related(
-        'primary_applications', 'additional_applications', 'language_installations__language',
+        'primary_applications', 'secondary_applications', 'language_installations__language',
         'datastore_instances__datastore'
     )
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -49,6 +132,12 @@ class ServerEnvironmentViewSet(viewsets.ModelViewSet):
     ordering_fields = ['hostname', 'created_at', 'environment_type']
     ordering = ['hostname']
 
+    def get_queryset(self):
+        if self.action in ('applications', 'resources'):
+            # These actions query the related rows themselves
+            return ServerEnvironment.objects.all()
+        return super().get_queryset()
+
     def get_serializer_class(self):
         if self.action == 'retrieve':
             return ServerEnvironmentDetailSerializer
@@ -58,8 +147,24 @@ class ServerEnvironmentViewSet(viewsets.ModelViewSet):
     def applications(self, request, pk=None):
         """Get all applications running on this server"""
         server = self.get_object()
-        primary_apps = server.primary_applications.all()
-        additional_apps = server.additional_applications.all()
+        
+        # Fetch both roles in one query and split the rows afterwards
+        hosted_additionally = Exists(
+            Application.additional_servers.through.objects.filter(
+                application=OuterRef('pk'), serverenvironment=server
+            )
+        )
+        # Nested relations come from the application viewset's prefetches, one query each
+        applications = ApplicationViewSet.queryset.annotate(
+            hosted_additionally=hosted_additionally
+        ).filter(Q(primary_server=server) | Q(hosted_additionally=True))
+        primary_apps = []
+        additional_apps = []
+        for application in applications:
+            if application.hosted_additionally:
+                additional_apps.append(application)
+            if application.primary_server_id == server.pk:
+                primary_apps.append(application)
         
         primary_data = ApplicationSerializer(primary_apps, many=True).data
         additional_data = ApplicationSerializer(additional_apps, many=True).data
@@ -74,8 +179,17 @@ class ServerEnvironmentViewSet(viewsets.ModelViewSet):
     def resources(self, request, pk=None):
         """Get language installations and datastore instances on this server"""
         server = self.get_object()
-        languages = LanguageInstallationSerializer(server.language_installations.all(), many=True).data
-        datastores = DataStoreInstanceSerializer(server.datastore_instances.all(), many=True).data
+        languages = _field_values(
+            LanguageInstallation.objects.filter(server=server),
+            language_name=F('language__name'),
+            server_hostname=F('server__hostname'),
+        )
+        datastores = _field_values(
+            DataStoreInstance.objects.filter(server=server),
+            datastore_name=F('datastore__name'),
+            datastore_type=F('datastore__datastore_type'),
+            server_hostname=F('server__hostname'),
+        )
         
         return Response({
             'language_installations': languages,
@@ -96,7 +210,7 @@ class LanguageViewSet(viewsets.ModelViewSet):
     def installations(self, request, pk=None):
         """Get all installations of this language"""
         language = self.get_object()
-        installations = language.installations.select_related('server').all()
+        installations = language.languageinstallation_set.select_related('language', 'server')
         serializer = LanguageInstallationSerializer(installations, many=True)
         return Response(serializer.data)
 
@@ -114,7 +228,7 @@ class DataStoreViewSet(viewsets.ModelViewSet):
     def instances(self, request, pk=None):
         """Get all instances of this datastore"""
         datastore = self.get_object()
-        instances = datastore.datastoreinstance_set.select_related('server').all()
+        instances = datastore.datastoreinstance_set.select_related('datastore', 'server')
         serializer = DataStoreInstanceSerializer(instances, many=True)
         return Response(serializer.data)
 
@@ -140,15 +254,28 @@ class DataStoreInstanceViewSet(viewsets.ModelViewSet):
 
 
 class ApplicationViewSet(viewsets.ModelViewSet):
+    # Each related set is fetched in one query with its own lookups joined in,
+    # rather than one extra query per level of a prefetch_related chain
     queryset = Application.objects.select_related(
         'primary_server', 'created_by', 'updated_by'
     ).prefetch_related(
         'additional_servers',
-        'language_dependencies__language_installation__language',
-        'language_dependencies__language_installation__server',
-        'datastore_dependencies__datastore_instance__datastore',
-        'datastore_dependencies__datastore_instance__server',
-        'lifecycle_events__performed_by'
+        Prefetch(
+            'language_dependencies',
+            queryset=ApplicationLanguageDependency.objects.select_related(
+                'language_installation__language', 'language_installation__server'
+            )
+        ),
+        Prefetch(
+            'datastore_dependencies',
+            queryset=ApplicationDataStoreDependency.objects.select_related(
+                'datastore_instance__datastore', 'datastore_instance__server'
+            )
+        ),
+        Prefetch(
+            'lifecycle_events',
+            queryset=ApplicationLifecycleEvent.objects.select_related('performed_by')
+        )
     )
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = [
@@ -159,7 +286,15 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     ordering_fields = ['name', 'lifecycle_stage', 'criticality', 'created_at']
     ordering = ['name']
 
+    def get_queryset(self):
+        if self.action == 'list':
+            # Paginated list pages only need a few columns and the server hostname
+            return Application.objects.select_related('primary_server').only(*APPLICATION_LIST_FIELDS)
+        return super().get_queryset()
+
     def get_serializer_class(self):
+        if self.action == 'list':
+            return ApplicationListSerializer
         if self.action == 'retrieve':
             return ApplicationDetailSerializer
         return ApplicationSerializer
@@ -167,20 +302,17 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user, updated_by=self.request.user)
 
+    @transaction.atomic
     def perform_update(self, serializer):
-        # Track lifecycle changes
-        if 'lifecycle_stage' in serializer.validated_data:
-            original = self.get_object()
-            new_stage = serializer.validated_data['lifecycle_stage']
-            if original.lifecycle_stage != new_stage:
-                ApplicationLifecycleEvent.objects.create(
-                    application=original,
-                    from_stage=original.lifecycle_stage,
-                    to_stage=new_stage,
-                    performed_by=self.request.user
-                )
+        # update() already loaded the row; read its stage before save overwrites it
+        old_stage = serializer.instance.lifecycle_stage
+        application = serializer.save(updated_by=self.request.user)
         
-        serializer.save(updated_by=self.request.user)
+        # Track lifecycle changes
+        if application.lifecycle_stage != old_stage:
+            _record_lifecycle_event(
+                application, old_stage, application.lifecycle_stage, self.request.user
+            )
 
     @action(detail=True, methods=['post'])
     def change_lifecycle_stage(self, request, pk=None):
@@ -194,7 +326,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        if new_stage not in dict(Application.LIFECYCLE_STAGES):
+        if new_stage not in VALID_LIFECYCLE_STAGES:
             return Response(
                 {'error': 'Invalid lifecycle stage'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -203,15 +335,13 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         old_stage = application.lifecycle_stage
         application.lifecycle_stage = new_stage
         application.updated_by = request.user
-        application.save()
         
-        # Create lifecycle event
-        ApplicationLifecycleEvent.objects.create(
-            application=application,
-            from_stage=old_stage,
-            to_stage=new_stage,
-            performed_by=request.user
-        )
+        with transaction.atomic():
+            # Write only the changed columns
+            application.save(update_fields=['lifecycle_stage', 'updated_by', 'updated_at'])
+            
+            # Create lifecycle event
+            _record_lifecycle_event(application, old_stage, new_stage, request.user)
         
         return Response({
             'message': f'Lifecycle stage changed from {old_stage} to {new_stage}',
@@ -222,12 +352,18 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     def dependencies(self, request, pk=None):
         """Get all dependencies for this application"""
         application = self.get_object()
-        language_deps = ApplicationLanguageDependencySerializer(
-            application.language_dependencies.all(), many=True
-        ).data
-        datastore_deps = ApplicationDataStoreDependencySerializer(
-            application.datastore_dependencies.all(), many=True
-        ).data
+        language_deps = _field_values(
+            ApplicationLanguageDependency.objects.filter(application=application),
+            language_name=F('language_installation__language__name'),
+            language_version=F('language_installation__version'),
+            server_hostname=F('language_installation__server__hostname'),
+        )
+        datastore_deps = _field_values(
+            ApplicationDataStoreDependency.objects.filter(application=application),
+            datastore_name=F('datastore_instance__datastore__name'),
+            datastore_type=F('datastore_instance__datastore__datastore_type'),
+            server_hostname=F('datastore_instance__server__hostname'),
+        )
         
         return Response({
             'language_dependencies': language_deps,
@@ -235,23 +371,11 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         })
 
     @action(detail=False, methods=['get'])
+    @method_decorator(cache_control(private=True, max_age=DASHBOARD_STATS_TTL))
+    @method_decorator(condition(etag_func=_dashboard_stats_etag))
     def dashboard_stats(self, request):
         """Get dashboard statistics"""
-        total_apps = Application.objects.count()
-        apps_by_stage = Application.objects.values('lifecycle_stage').annotate(
-            count=Count('id')
-        ).order_by('lifecycle_stage')
-        apps_by_criticality = Application.objects.values('criticality').annotate(
-            count=Count('id')
-        ).order_by('criticality')
-        
-        return Response({
-            'total_applications': total_apps,
-            'by_lifecycle_stage': list(apps_by_stage),
-            'by_criticality': list(apps_by_criticality),
-            'active_applications': Application.objects.filter(is_active=True).count(),
-            'inactive_applications': Application.objects.filter(is_active=False).count()
-        })
+        return Response(get_dashboard_stats())
 
 
 class ApplicationLanguageDependencyViewSet(viewsets.ModelViewSet):
@@ -279,14 +403,15 @@ class ApplicationDataStoreDependencyViewSet(viewsets.ModelViewSet):
 
 
 class ApplicationLifecycleEventViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = ApplicationLifecycleEvent.objects.select_related(
-        'application', 'performed_by'
-    ).order_by('-event_date')
+    # The serializer renders application as a pk and stages as plain values;
+    # performed_by's username is the only related data it reads
+    queryset = ApplicationLifecycleEvent.objects.select_related('performed_by').order_by('-event_date')
     serializer_class = ApplicationLifecycleEventSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['application', 'from_stage', 'to_stage', 'performed_by']
     ordering_fields = ['event_date']
     ordering = ['-event_date']
+    pagination_class = LifecycleEventCursorPagination
 
 
 class CloudPluginViewSet(viewsets.ModelViewSet):
@@ -15,6 +15,8 @@ Options:
     --api        : Run only API tests
     --audit      : Run only audit logging tests
     --docs       : Run only documentation access tests
+    --keepdb     : Preserve the test database between runs (default; --no-keepdb to rebuild)
+    --parallel N : Number of test processes (default: one per CPU; 1 to disable)
     --help       : Show this help message
 """
 
@@ -37,13 +39,13 @@ def setup_django():
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app_tracker.settings')
     django.setup()
 
-def run_test_suite(test_labels, verbosity=1, keepdb=False):
+def run_test_suite(test_labels, verbosity=1, keepdb=False, parallel=0):
     """Run a specific test suite"""
     from django.test.utils import get_runner
     from django.conf import settings
     
     TestRunner = get_runner(settings)
-    test_runner = TestRunner(verbosity=verbosity, keepdb=keepdb)
+    test_runner = TestRunner(verbosity=verbosity, keepdb=keepdb, parallel=parallel)
     
     start_time = time.time()
     failures = test_runner.run_tests(test_labels)
@@ -71,16 +73,27 @@ def main():
     parser.add_argument('--api', '-a', action='store_true', help='Run only API tests')
     parser.add_argument('--audit', action='store_true', help='Run only audit tests')
     parser.add_argument('--docs', '-d', action='store_true', help='Run only documentation tests')
-    parser.add_argument('--keepdb', '-k', action='store_true', help='Preserve test database')
+    parser.add_argument('--keepdb', '-k', action=argparse.BooleanOptionalAction, default=True,
+                        help='Preserve test database between runs (default: on)')
+    parser.add_argument('--parallel', '-p', type=int, default=None,
+                        help='Number of test processes (default: one per CPU)')
     
     args = parser.parse_args()
     
     # Set up Django
     setup_django()
     
+    from django.test.runner import get_max_test_processes
+    
     verbosity = 2 if args.verbose else 1
-    total_failures = 0
-    total_duration = 0
+    parallel = args.parallel if args.parallel is not None else get_max_test_processes()
+    if parallel > 1:
+        try:
+            import tblib  # noqa: F401
+        except ImportError:
+            # Worker processes can't report failures without tblib
+            print("tblib is not installed; running tests in a single process")
+            parallel = 1
     
     print("Starting Enterprise Application Tracker Test Suite")
     print("=" * 60)
@@ -109,21 +122,19 @@ def main():
             'Documentation Access Tests': ['apps.inventory.test_documentation']
         }
     
-    # Run test suites
-    for suite_name, test_labels in test_suites.items():
-        print(f"\nRunning {suite_name}...")
-        print("-" * 40)
-        
-        try:
-            failures, duration = run_test_suite(test_labels, verbosity, args.keepdb)
-            print_test_summary(suite_name, failures, duration)
-            
-            total_failures += failures
-            total_duration += duration
-            
-        except Exception as e:
-            print(f"ERROR: Error running {suite_name}: {e}")
-            total_failures += 1
+    # Run the selected suites in one pass so the test database is only set up once
+    test_labels = [label for labels in test_suites.values() for label in labels]
+    print(f"\nRunning {', '.join(test_suites)} ({parallel} process(es))...")
+    print("-" * 40)
+    
+    try:
+        total_failures, total_duration = run_test_suite(
+            test_labels, verbosity, args.keepdb, parallel
+        )
+        print_test_summary("Selected Suites", total_failures, total_duration)
+    except Exception as e:
+        print(f"ERROR: Error running tests: {e}")
+        total_failures, total_duration = 1, 0
     
     # Print overall summary
     print("\n" + "=" * 60)
@@ -135,7 +146,7 @@ def main():
         print(f"Total duration: {total_duration:.2f}s")
         exit_code = 0
     else:
-        print(f"FAILED: {total_failures} TEST SUITE(S) FAILED")
+        print(f"FAILED: {total_failures} TEST(S) FAILED")
         print(f"Total duration: {total_duration:.2f}s")
         exit_code = 1
     
@@ -10,7 +10,12 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app_tracker.settings')
 django.setup()
 
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, Q
+from apps.inventory.audit import audit_logger
+from apps.inventory.caching import invalidate_user_lists
 from apps.inventory.models import UserProfile
 
 
@@ -78,42 +83,73 @@ def create_test_users():
         }
     ]
     
-    for user_data in users_data:
-        try:
-            # Try to get existing user or create new one
-            user, user_created = User.objects.get_or_create(
-                username=user_data['username'],
-                defaults={
-                    'email': user_data['email'],
-                    'first_name': user_data['first_name'],
-                    'last_name': user_data['last_name']
-                }
-            )
+    try:
+        with transaction.atomic():
+            # Look up every test user at once and insert the missing ones together
+            usernames = [user_data['username'] for user_data in users_data]
+            existing_users = User.objects.in_bulk(usernames, field_name='username')
+            User.objects.bulk_create([
+                User(
+                    username=user_data['username'],
+                    email=user_data['email'],
+                    first_name=user_data['first_name'],
+                    last_name=user_data['last_name'],
+                    password=make_password(user_data['password'])
+                )
+                for user_data in users_data
+                if user_data['username'] not in existing_users
+            ])
+            users = User.objects.in_bulk(usernames, field_name='username')
+            
+            for username in usernames:
+                if username in existing_users:
+                    print(f"🔄 User exists: {username}")
+                else:
+                    print(f"✅ Created user: {username}")
             
-            if user_created:
-                user.set_password(user_data['password'])
-                user.save()
-                print(f"✅ Created user: {user.username}")
-            else:
-                print(f"🔄 User exists: {user.username}")
+            # Same for profiles
+            existing_profiles = {
+                profile.user_id: profile
+                for profile in UserProfile.objects.filter(user__in=users.values()).select_related('user')
+            }
+            new_profiles = [
+                UserProfile(
+                    user=users[user_data['username']],
+                    role=user_data['role'],
+                    department=user_data['department'],
+                    phone=user_data['phone']
+                )
+                for user_data in users_data
+                if users[user_data['username']].id not in existing_profiles
+            ]
+            for profile in new_profiles:
+                profile.apply_documentation_defaults()
+            new_profiles = UserProfile.objects.bulk_create(new_profiles)
             
-            # Create or update profile
-            profile, profile_created = UserProfile.objects.get_or_create(
-                user=user,
-                defaults={
-                    'role': user_data['role'],
-                    'department': user_data['department'],
-                    'phone': user_data['phone']
-                }
-            )
+            if new_profiles and new_profiles[0].pk is None:
+                # Backend can't return ids from bulk inserts (e.g. MySQL); reload them
+                new_profiles = list(
+                    UserProfile.objects.filter(user__in=[p.user_id for p in new_profiles])
+                    .select_related('user')
+                )
             
-            if profile_created:
-                print(f"✅ Created profile: {profile}")
-            else:
-                print(f"🔄 Profile exists: {profile}")
-                
-        except Exception as e:
-            print(f"❌ Error creating user {user_data['username']}: {e}")
+            # bulk_create skips save() and post_save, so log and invalidate here
+            for profile in new_profiles:
+                audit_logger.log_create(profile)
+            if new_profiles:
+                invalidate_user_lists()
+            
+            created_profiles = {profile.user_id: profile for profile in new_profiles}
+            for username in usernames:
+                user_id = users[username].id
+                if user_id in existing_profiles:
+                    print(f"🔄 Profile exists: {existing_profiles[user_id]}")
+                else:
+                    print(f"✅ Created profile: {created_profiles[user_id]}")
+    
+    except Exception as e:
+        print(f"❌ Error creating test users: {e}")
+        return False
     
     return True
 
@@ -137,22 +173,27 @@ def display_summary():
     print("\n📊 User Management System Summary:")
     print("=" * 50)
     
-    total_users = User.objects.count()
-    active_users = User.objects.filter(is_active=True).count()
-    total_profiles = UserProfile.objects.count()
+    user_totals = User.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True))
+    )
+    total_users = user_totals['total']
+    active_users = user_totals['active']
+    
+    # Count profiles per role in the database rather than loading them all
+    role_counts = dict(
+        UserProfile.objects.values_list('role').annotate(count=Count('id')).order_by()
+    )
+    total_profiles = sum(role_counts.values())
     
     print(f"Total Users: {total_users}")
     print(f"Active Users: {active_users}")
     print(f"User Profiles: {total_profiles}")
     
     print("\nUsers by Role:")
-    role_counts = {}
-    for profile in UserProfile.objects.all():
-        role_display = profile.get_role_display()
-        role_counts[role_display] = role_counts.get(role_display, 0) + 1
-    
-    for role, count in role_counts.items():
-        print(f"  • {role}: {count}")
+    for role, role_display in UserProfile.USER_ROLES:
+        if role in role_counts:
+            print(f"  • {role_display}: {role_counts[role]}")
     
     print("\n🎯 Role-Based Access Control System is ready!")
     print("\nNext steps:")
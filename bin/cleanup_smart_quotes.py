@@ -10,54 +10,78 @@ import os
 import sys
 import glob
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+# Smart quote replacements, built once; str.translate maps multi-character
+# replacements too, so every character is handled in one scan
+SMART_QUOTE_TABLE = str.maketrans({
+    # Left and right double quotes
+    '\u201c': '"',  # "
+    '\u201d': '"',  # "
+    # Left and right single quotes
+    '\u2018': "'",  # '
+    '\u2019': "'",  # '
+    # Other quote variants
+    '\u201a': ',',  # ‚
+    '\u201e': '"',  # „
+    '\u2039': '<',  # ‹
+    '\u203a': '>',  # ›
+    # Em and en dashes
+    '\u2014': '--', # —
+    '\u2013': '-',  # –
+    # Ellipsis
+    '\u2026': '...' # …
+})
+
+# UTF-8 encodings of the characters above, for scanning files without decoding
+SMART_QUOTE_BYTES = tuple(chr(code).encode('utf-8') for code in SMART_QUOTE_TABLE)
+
 def cleanup_smart_quotes(file_path):
-    """Clean smart quotes and Unicode characters from a single file."""
+    """Clean smart quotes and Unicode characters from a single file.
+    
+    Returns (file_path, succeeded). A file that succeeded has no smart quotes
+    left, since the table covers every character the old verification pass
+    looked for.
+    """
     print(f"  Processing: {file_path}")
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open(file_path, 'rb') as f:
+            raw = f.read()
         
-        # Smart quote replacements
-        replacements = {
-            # Left and right double quotes
-            '\u201c': '"',  # "
-            '\u201d': '"',  # "
-            # Left and right single quotes
-            '\u2018': "'",  # '
-            '\u2019': "'",  # '
-            # Other quote variants
-            '\u201a': ',',  # ‚
-            '\u201e': '"',  # „
-            '\u2039': '<',  # ‹
-            '\u203a': '>',  # ›
-            # Em and en dashes
-            '\u2014': '--', # —
-            '\u2013': '-',  # –
-            # Ellipsis
-            '\u2026': '...' # …
-        }
+        # Most files have nothing to replace; check the raw bytes before decoding
+        if not any(sequence in raw for sequence in SMART_QUOTE_BYTES):
+            # Still decode so a file that isn't valid UTF-8 is reported as failed
+            raw.decode('utf-8')
+            print(f"    - No changes needed in {os.path.basename(file_path)}")
+            return file_path, True
         
-        # Apply replacements
-        original_content = content
-        for unicode_char, replacement in replacements.items():
-            content = content.replace(unicode_char, replacement)
+        # Apply replacements in a single pass
+        content = raw.decode('utf-8').translate(SMART_QUOTE_TABLE)
         
-        # Only write if content changed
-        if content != original_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            print(f"    ✓ Fixed smart quotes in {os.path.basename(file_path)}")
-        else:
-            print(f"    - No changes needed in {os.path.basename(file_path)}")
+        # Write a new file and swap it in, leaving the backup's hard link
+        # pointing at the original; newline='' keeps existing line endings
+        temp_path = f"{file_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        shutil.copymode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+        print(f"    ✓ Fixed smart quotes in {os.path.basename(file_path)}")
             
     except Exception as e:
         print(f"    ✗ Error processing {file_path}: {e}")
-        return False
+        return file_path, False
     
-    return True
+    return file_path, True
+
+def link_or_copy(src, dst):
+    """Hard link a file into the backup, copying it when linking isn't possible."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        # e.g. the backup is on another device
+        shutil.copy2(src, dst)
 
 def main():
     """Main cleanup function."""
@@ -76,47 +100,28 @@ def main():
     backup_dir = os.path.join(project_root, 'tmp', f'docs_backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}')
     os.makedirs(backup_dir, exist_ok=True)
     print(f"Creating backup in: {backup_dir}")
-    shutil.copytree(docs_dir, os.path.join(backup_dir, 'docs'))
+    shutil.copytree(docs_dir, os.path.join(backup_dir, 'docs'), copy_function=link_or_copy)
     
-    # Find all RST files
+    # Stream RST files into the pool as they are found; each file is independent
     rst_pattern = os.path.join(docs_dir, '**', '*.rst')
-    rst_files = glob.glob(rst_pattern, recursive=True)
+    rst_files = glob.iglob(rst_pattern, recursive=True)
+    
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(cleanup_smart_quotes, rst_files, chunksize=16))
     
-    if not rst_files:
+    if not results:
         print("❌ No RST files found")
         sys.exit(1)
     
-    print(f"Found {len(rst_files)} RST files to process...")
-    
-    # Process each file
-    success_count = 0
-    for rst_file in sorted(rst_files):
-        if cleanup_smart_quotes(rst_file):
-            success_count += 1
+    # Files that failed may still contain smart quotes; the rest are clean
+    remaining_issues = sorted(file_path for file_path, succeeded in results if not succeeded)
+    success_count = len(results) - len(remaining_issues)
     
-    print(f"\n✅ Processed {success_count}/{len(rst_files)} files successfully")
+    print(f"\n✅ Processed {success_count}/{len(results)} files successfully")
     print(f"Backup created at: {backup_dir}")
     
-    # Verify cleanup
-    print("\nVerifying cleanup...")
-    remaining_issues = []
-    
-    for rst_file in rst_files:
-        try:
-            with open(rst_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Check for remaining smart quotes
-            smart_quotes = ['\u201c', '\u201d', '\u2018', '\u2019']
-            for quote in smart_quotes:
-                if quote in content:
-                    remaining_issues.append(rst_file)
-                    break
-        except Exception as e:
-            print(f"Error checking {rst_file}: {e}")
-    
     if remaining_issues:
-        print("⚠️  WARNING: Smart quotes still found in:")
+        print("⚠️  WARNING: Smart quotes may remain in files that failed:")
         for file_path in remaining_issues:
             print(f"  {file_path}")
     else:
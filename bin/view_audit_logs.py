@@ -6,57 +6,204 @@ This script demonstrates how to read and parse the audit log files.
 The logs are designed to be both human-readable and script-parseable.
 
 Usage:
-    python view_audit_logs.py [--json-only] [--user USERNAME] [--action ACTION] [--model MODEL] [--since DATETIME]
+    python view_audit_logs.py [--json-only | --raw] [--user USERNAME] [--action ACTION] [--model MODEL] [--since DATETIME]
 """
 
 import json
 import argparse
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
 import os
 
+try:
+    # Much faster per-line parsing when available; output still uses json.dumps
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# Separates the human-readable header from the JSON payload on each line
+JSON_MARKER = b'| JSON: '
+
+# Format of the entry timestamps written by the audit logger
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+TIMESTAMP_LENGTH = len('YYYY-MM-DD HH:MM:SS')
+
+# Logs at least this large are scanned by worker processes, one chunk each
+PARALLEL_SCAN_MIN_SIZE = 64 * 1024 * 1024
+PARALLEL_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+def iter_lines(path, start=0, end=None):
+    """Yield the raw (undecoded) lines of a log file that start in [start, end)"""
+    # A large buffer lets the C line splitter work through big logs in few reads
+    with open(path, 'rb', buffering=1024 * 1024) as f:
+        if start:
+            # Skip the line in progress at `start`; the previous chunk owns it
+            f.seek(start - 1)
+            start += len(f.readline()) - 1
+        if end is None:
+            yield from f
+            return
+        
+        position = start
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line
+
+
+def tail_lines(path, count, block_size=64 * 1024):
+    """Return the last `count` raw lines of a log file, reading blocks back from the end"""
+    blocks = []
+    newlines = 0
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        # One newline more than requested, so the first returned line is whole
+        while position > 0 and newlines <= count:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            block = f.read(read_size)
+            newlines += block.count(b'\n')
+            blocks.append(block)
+    
+    data = b''.join(reversed(blocks))
+    return data.splitlines(keepends=True)[-count:]
+
 
 def parse_log_entry(line):
-    """Parse a single audit log entry"""
+    """Parse a single audit log entry from a raw (bytes) log line"""
     try:
-        # Extract JSON from the end of the line
-        json_start = line.rfind('| JSON: ')
+        # Extract JSON from the end of the line; the header is never decoded
+        json_start = line.rfind(JSON_MARKER)
         if json_start == -1:
             return None
         
-        json_str = line[json_start + 8:].strip()  # Remove '| JSON: ' prefix
-        return json.loads(json_str)
-    except (json.JSONDecodeError, ValueError):
+        # Both parsers accept bytes and ignore surrounding whitespace
+        return json_loads(line[json_start + len(JSON_MARKER):])
+    except ValueError:
         return None
 
 
-def filter_entry(entry, filters):
-    """Check if entry matches the provided filters"""
-    if not entry:
-        return False
+def iter_raw_payloads(lines, matches=None):
+    """Yield the JSON payload of each raw log line as logged.
     
-    # User filter
-    if filters.get('user') and entry.get('user', '').lower() != filters['user'].lower():
-        return False
+    Payloads are only parsed when there is a `matches` predicate to apply;
+    matching ones are still yielded exactly as they appear in the log.
+    """
+    for line in lines:
+        json_start = line.rfind(JSON_MARKER)
+        if json_start == -1:
+            continue
+        
+        payload = line[json_start + len(JSON_MARKER):].strip()
+        if matches is not None:
+            try:
+                entry = json_loads(payload)
+            except ValueError:
+                continue
+            if not (entry and matches(entry)):
+                continue
+        yield payload.decode(errors='replace')
+
+
+def build_filter(filters):
+    """Build a predicate for the provided filters, normalizing their values once.
     
-    # Action filter
-    if filters.get('action') and entry.get('action', '').lower() != filters['action'].lower():
-        return False
+    Returns None when no filters are active, so callers can skip the check.
+    """
+    user = filters['user'].lower() if filters.get('user') else None
+    action = filters['action'].lower() if filters.get('action') else None
+    model = filters['model'].lower() if filters.get('model') else None
+    since = filters.get('since')
     
-    # Model filter
-    if filters.get('model') and filters['model'].lower() not in entry.get('model', '').lower():
-        return False
+    if not (user or action or model or since):
+        return None
     
-    # Since filter (timestamp)
-    if filters.get('since'):
-        try:
-            entry_time = datetime.strptime(entry.get('timestamp', ''), '%Y-%m-%d %H:%M:%S')
-            if entry_time < filters['since']:
+    def matches(entry):
+        # User filter
+        if user and entry.get('user', '').lower() != user:
+            return False
+        
+        # Action filter
+        if action and entry.get('action', '').lower() != action:
+            return False
+        
+        # Model filter
+        if model and model not in entry.get('model', '').lower():
+            return False
+        
+        # Since filter (timestamp); fixed-width timestamps sort as strings.
+        # Entries with a timestamp in any other shape are kept, as before.
+        if since:
+            timestamp = entry.get('timestamp', '')
+            if len(timestamp) == TIMESTAMP_LENGTH and timestamp < since:
                 return False
-        except ValueError:
-            pass
+        
+        return True
+    
+    return matches
+
+
+def iter_matching_entries(lines, matches):
+    """Yield the parsed entries from raw log lines that pass `matches` (all when it is None)"""
+    # Separate loops, so an unfiltered scan doesn't call a predicate per line
+    if matches is None:
+        for line in lines:
+            line = line.strip()
+            if line:
+                entry = parse_log_entry(line)
+                if entry:
+                    yield entry
+        return
     
-    return True
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        
+        entry = parse_log_entry(line)
+        if entry and matches(entry):
+            yield entry
+
+
+def scan_chunk(path, start, end, filters, output_format):
+    """Return the formatted matching entries from one chunk of a log file"""
+    lines = iter_lines(path, start, end)
+    if output_format == 'raw':
+        return list(iter_raw_payloads(lines, build_filter(filters)))
+    entries = iter_matching_entries(lines, build_filter(filters))
+    return [format_entry(entry, output_format) for entry in entries]
+
+
+def scan_parallel(path, size, filters, output_format):
+    """Yield formatted matching entries, scanning chunks of the file in worker processes"""
+    # Only a few chunks are in flight or waiting to be printed at a time, so
+    # memory stays bounded however large the file or slow the output
+    window = (os.cpu_count() or 1) * 2
+    pending = deque()
+    with ProcessPoolExecutor() as executor:
+        for start in range(0, size, PARALLEL_CHUNK_SIZE):
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+            end = min(start + PARALLEL_CHUNK_SIZE, size)
+            pending.append(executor.submit(scan_chunk, path, start, end, filters, output_format))
+        
+        # Results are taken in submission order, which is file order
+        while pending:
+            yield from pending.popleft().result()
+
+
+def format_entry(entry, output_format='human'):
+    """Format entry as indented JSON or for human reading"""
+    if output_format == 'json':
+        return json.dumps(entry, indent=2)
+    return format_entry_human(entry)
 
 
 def format_entry_human(entry):
@@ -68,35 +215,46 @@ def format_entry_human(entry):
     user = entry.get('user', 'Unknown')
     object_str = entry.get('object_str', 'Unknown')
     
-    result = f"[{timestamp}] {action} {model}#{object_id} by {user}: {object_str}"
+    parts = [f"[{timestamp}] {action} {model}#{object_id} by {user}: {object_str}"]
     
-    # Add changes for UPDATE operations
+    # Add changes for UPDATE operations. join() is handed lists rather than
+    # generators; it builds a list from a generator first and is slower for it.
     if action == 'UPDATE' and entry.get('changes'):
-        changes_list = []
-        for field, change in entry['changes'].items():
-            old_val = change.get('old', 'None')
-            new_val = change.get('new', 'None')
-            changes_list.append(f"{field}: {old_val} -> {new_val}")
-        if changes_list:
-            result += f"\n    Changes: {'; '.join(changes_list)}"
+        parts.append("    Changes: " + '; '.join([
+            f"{field}: {change.get('old', 'None')} -> {change.get('new', 'None')}"
+            for field, change in entry['changes'].items()
+        ]))
     
     # Add additional info if present
     if entry.get('additional_info'):
-        info_list = []
-        for key, value in entry['additional_info'].items():
-            info_list.append(f"{key}: {value}")
-        if info_list:
-            result += f"\n    Info: {'; '.join(info_list)}"
+        parts.append("    Info: " + '; '.join([
+            f"{key}: {value}" for key, value in entry['additional_info'].items()
+        ]))
     
-    return result
+    return '\n'.join(parts)
+
+
+def open_output():
+    """Open a large-buffered text stream on stdout, or use stdout as is when it has no file descriptor"""
+    sys.stdout.flush()
+    try:
+        fileno = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        # StringIO redirects, pytest capture and some IDE consoles
+        return nullcontext(sys.stdout)
+    return open(fileno, 'w', buffering=1024 * 1024, closefd=False,
+                encoding=sys.stdout.encoding, errors=sys.stdout.errors)
 
 
 def main():
     parser = argparse.ArgumentParser(description='View and filter audit logs')
     parser.add_argument('--log-file', 
                        help='Path to audit log file (default: ./logs/audit.log)')
-    parser.add_argument('--json-only', action='store_true',
-                       help='Output only JSON data for script processing')
+    output_group = parser.add_mutually_exclusive_group()
+    output_group.add_argument('--json-only', action='store_true',
+                             help='Output only JSON data for script processing')
+    output_group.add_argument('--raw', action='store_true',
+                             help='Output the JSON data as logged, one entry per line')
     parser.add_argument('--user', 
                        help='Filter by username')
     parser.add_argument('--action', 
@@ -141,48 +299,61 @@ def main():
         filters['model'] = args.model
     if args.since:
         try:
-            filters['since'] = datetime.strptime(args.since, '%Y-%m-%d %H:%M:%S')
+            # Validate once, then compare in the canonical zero-padded form
+            since = datetime.strptime(args.since, TIMESTAMP_FORMAT)
+            filters['since'] = since.strftime(TIMESTAMP_FORMAT)
         except ValueError:
             print("Error: --since must be in format 'YYYY-MM-DD HH:MM:SS'")
             sys.exit(1)
     
     # Read and process log file
     try:
-        with open(log_file, 'r') as f:
-            lines = f.readlines()
-        
-        if not lines:
+        size = os.path.getsize(log_file)
+        if size == 0:
             print("Audit log file is empty")
             return
         
-        # Apply tail filter
+        if args.raw:
+            output_format = 'raw'
+        elif args.json_only:
+            output_format = 'json'
+        else:
+            output_format = 'human'
+        
+        # Read only the last blocks when tailing, split large logs across
+        # worker processes, and otherwise stream the file in this process
         if args.tail > 0:
-            lines = lines[-args.tail:]
+            lines = tail_lines(log_file, args.tail)
+        else:
+            lines = iter_lines(log_file)
         
-        matching_entries = []
+        # Unfiltered --raw output is pure I/O; echo the payloads unparsed
+        raw_echo = output_format == 'raw' and not filters
+        if not raw_echo and args.tail <= 0 and size >= PARALLEL_SCAN_MIN_SIZE and (os.cpu_count() or 1) > 1:
+            outputs = scan_parallel(log_file, size, filters, output_format)
+        elif output_format == 'raw':
+            # Raw payloads are echoed as logged, filtered or not
+            outputs = iter_raw_payloads(lines, build_filter(filters))
+        else:
+            entries = iter_matching_entries(lines, build_filter(filters))
+            outputs = (format_entry(entry, output_format) for entry in entries)
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            entry = parse_log_entry(line)
-            if entry and filter_entry(entry, filters):
-                matching_entries.append((line, entry))
+        # Write entries as they are found; only the running count is kept.
+        # A large buffer batches many entries per write, even on a terminal.
+        count = 0
+        separator = "\n" if output_format == 'raw' else "\n" + "-" * 80 + "\n"
+        with open_output() as out:
+            for output in outputs:
+                count += 1
+                out.write(output)
+                out.write(separator)
         
-        if not matching_entries:
+        if not count:
             print("No matching audit log entries found")
             return
         
-        print(f"Found {len(matching_entries)} matching audit log entries")
-        print("=" * 80)
-        
-        for line, entry in matching_entries:
-            if args.json_only:
-                print(json.dumps(entry, indent=2))
-            else:
-                print(format_entry_human(entry))
-            print("-" * 80)
+        # The total is only known at the end; keep it off stdout for JSON consumers
+        print(f"Found {count} matching audit log entries", file=sys.stderr)
     
     except FileNotFoundError:
         print(f"Error: Could not find audit log file: {log_file}")